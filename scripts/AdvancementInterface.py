@@ -15,15 +15,16 @@ from tools import (
     Resources,
     Patterns,
 )
-from tools.BaseTranslationGenerator import BaseTranslationGenerator
 from tools.ComponentsInterface import ComponentsInterface as Ci
-from tools.DatapackFunctionsGenerator import DatapackFunctionsGenerator
+from tools.FileWatcher import FileWatcher
+from tools.FileWriter import FileWriter
 from tools.Interface import MenuInterface, exit_on_empty_input
 from tools.Interface import func_loop as loop
 from tools.InterfaceSchema import *
 from tools.MilestonesGenerator import MilestonesGenerator
 from tools.MissingTranslationFinder import MissingTranslationFinder
 from tools.Release import Release
+from tools.ReleasePipeline import PipelineCancelled, ReleasePipeline, Stage
 from tools.Validator import Validator, SpellingValidator
 from tools.utils import cut_namespace, multi_replace, user_config
 from tools.ChecklistGenerators import MobUniverseGenerator, BabyZooGenerator
@@ -476,28 +477,13 @@ class MainInterface:
     def advancement_menu(self):
         func_mi.menu()
 
-    @mi.register_func("Create Release", "release")
-    def release(self):
-        AdvancementsManager.generate()  # Updates all the advancement before release
-
-        BaseTranslationGenerator.update(DatapackList.default)
-        output("Base Translation updated")
-
-        MilestonesGenerator.generate_all(DatapackList.default)
-        output("Milestones created")
-
-        DatapackFunctionsGenerator.generate_all(DatapackList.default)
-        output("Datapack Functions created")
-
-        MobUniverseGenerator(DatapackList.default.default_adv_namespace_path).generate_all_files()
-        output("Mob Universe created")
-        BabyZooGenerator(DatapackList.default.default_adv_namespace_path).generate_all_files()
-        output("Baby Zoo created")
-
-        Release.format_datapack_json(DatapackList.work_with)
-        output("All Advancements formatted")
+    @staticmethod
+    def _check_stage(datapack) -> Stage:
+        """
+        Shows warnings of the datapack, asks whether to continue and the release version.
+        """
 
-        for datapack in DatapackList.work_with:
+        def check():
             output(datapack, icon=Icon("[D]"))
             if count := Release.check(datapack):
                 if not get_bool(
@@ -506,17 +492,55 @@ class MainInterface:
                         icon=Icon("[>]", color="yellow", bold=True),
                         indent=3,
                 ):
-                    return
-            version = get_value("Version:", indent=3)
-            Release.create_install(datapack, version)
-            output("Install created", indent=3)
-            Release.create_datapack_zip(datapack, version)
-            Release.create_language_pack_zip(datapack)
-            output("Zip created", indent=3)
-        output("Release created")
+                    raise PipelineCancelled
+            return get_value("Version:", indent=3)
+
+        return Stage(
+            f"check {datapack.name}",
+            check,
+            ("format",),
+            interactive=True,
+            resources=(Release.advancements_resource,),
+        )
 
-        dw.create()
-        output("data.json has been updated")
+    @mi.register_func("Create Release", "release")
+    def release(self):
+        AdvancementsManager.generate()  # Updates all the advancement before release
+        FileWriter.reset_counters()
+
+        datapacks = DatapackList.work_with
+        checks = [self._check_stage(datapack) for datapack in datapacks]
+        stages = [
+            *Release.generation_stages(datapacks),
+            *checks,
+            *Release.zip_stages(
+                datapacks, lambda dp: pipeline.results[f"check {dp.name}"]
+            ),
+            Stage(
+                "data.json",
+                dw.create,
+                tuple(stage.name for stage in checks),
+                "data.json has been updated",
+                interactive=True,
+                resources=(Release.advancements_resource,),
+            ),
+        ]
+        pipeline = ReleasePipeline(stages, Release.pipeline_inputs(datapacks))
+
+        resume = False
+        if completed := pipeline.resumable():
+            resume = get_bool(
+                f"The last release has been stopped after: {', '.join(completed)}\n"
+                f"Do you want to resume it [y/n]:"
+            )
+        try:
+            pipeline.run(resume=resume)
+        except PipelineCancelled:
+            return
+        finally:
+            written, unchanged = FileWriter.reset_counters()
+            output(f"Files written: {written}, unchanged: {unchanged}")
+        output("Release created")
 
     @mi.register_func("Save to mc", "s")
     def save_to_mc(self):
@@ -564,4 +588,5 @@ class MainInterface:
 
 if __name__ == "__main__":
     AdvancementsManager.generate(force=True)
+    FileWatcher.start_if_enabled()
     mi.menu()
@@ -6,6 +6,7 @@ from scripts.WorldBorder.Types import DATAPACK_PRESET_PATH, NoAdvancementReward
 from scripts.WorldBorder.WBDataSet import WBDataSet
 from scripts.tools import DatapackList
 from scripts.tools.Advancement import AdvancementsManager
+from scripts.tools.FileWatcher import FileWatcher
 from scripts.tools.Interface import MenuInterface
 from scripts.tools.InterfaceSchema import eget_value, print_warning
 from tools import fill_pattern, user_config
@@ -100,4 +101,5 @@ class MI:
 
         threading.Thread(target=save_operation).start()
 
-AdvancementsManager.generate(force=True)
\ No newline at end of file
+AdvancementsManager.generate(force=True)
+FileWatcher.start_if_enabled()
\ No newline at end of file
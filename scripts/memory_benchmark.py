@@ -0,0 +1,93 @@
+"""
+Measures memory used by loaded advancements with tracemalloc.
+Run from the root of the repository: python scripts/memory_benchmark.py
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from tools.Advancement import AdvancementsManager, Advancement
+
+
+def traced_memory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def instance_size(obj: object) -> int:
+    """
+    :return: Size of the object and its __dict__, if it has one.
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def advancement_instances_size(adv: Advancement) -> int:
+    """
+    :return: Size of the advancement and its instances of tools classes
+    (without shared data).
+    """
+    functions = adv.functions
+    parts = (
+        functions.main,
+        functions.exp,
+        functions.msg,
+        functions.reward,
+        functions.trophy,
+    )
+    objects = [adv, adv.color, adv.icon, functions, *parts, *adv.criteria_list]
+    objects += [item for item in (functions.reward.item, functions.trophy.item) if item]
+    return sum(map(instance_size, objects))
+
+
+def main():
+    tracemalloc.start()
+
+    start = traced_memory()
+    AdvancementsManager.generate(force=True)
+    loaded = traced_memory()
+
+    advancements = AdvancementsManager.adv_list()
+    normal = [adv for adv in advancements if isinstance(adv, Advancement)]
+    # Icons, criteria and function files are parsed on the first access
+    failed = set()
+    for adv in normal:
+        try:
+            adv.icon
+            adv.criteria_list
+            adv.functions.exp.value
+            adv.functions.reward.item
+            adv.functions.trophy.item
+        except ValueError:
+            failed.add(adv)
+    parsed = traced_memory()
+
+    print(
+        f"Advancements: {len(advancements)} ({len(normal)} normal, "
+        f"{len(failed)} with unparsable functions)"
+    )
+    print(
+        f"Loaded: {loaded - start} bytes, "
+        f"{(loaded - start) / len(advancements):.0f} bytes per advancement"
+    )
+    print(
+        f"Parsed data: {parsed - loaded} bytes, "
+        f"{(parsed - loaded) / len(normal):.0f} bytes per normal advancement"
+    )
+    print(
+        f"Total: {parsed - start} bytes, "
+        f"{(parsed - start) / len(advancements):.0f} bytes per advancement"
+    )
+    instances = [
+        advancement_instances_size(adv) for adv in normal if adv not in failed
+    ]
+    print(
+        f"Instances: {sum(instances) / len(instances):.0f} bytes per normal advancement"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Compares the nbt decoders and encoders with the ones of a baseline revision
+on all trophy and reward functions of datapacks and checks that everything they contain round-trips.
+The baseline parsers are loaded from git, by default from the parent of the commit,
+which introduced the single-pass tokenizer of nbt_parser.
+Run from the root of the repository: python scripts/nbt_benchmark.py [repeats] [baseline revision]
+"""
+
+import importlib
+import re
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Any, Callable
+
+from tools import components_parser, nbt_parser
+from tools.Patterns import FunctionsReadPatterns
+from tools.components_parser import item_components_decoder, item_components_encoder
+from tools.nbt_parser import nbt_decoder, nbt_encoder
+
+
+def git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], check=True, capture_output=True, encoding="utf-8"
+    ).stdout
+
+
+def default_baseline() -> str:
+    """
+    :return: Parent of the commit, which added the tokenizer to nbt_parser.
+    """
+    commits = git(
+        "log",
+        "--reverse",
+        "--format=%H",
+        "-S",
+        "def _tokenize(",
+        "HEAD",
+        "--",
+        "scripts/tools/nbt_parser.py",
+    ).split()
+    if not commits:
+        raise SystemExit("The tokenizer commit isn't found, pass the baseline revision")
+    return f"{commits[0]}^"
+
+
+def load_baseline(revision: str) -> tuple[types.ModuleType, types.ModuleType]:
+    """
+    Loads nbt_parser and components_parser of the revision as modules of a separate package.
+    Their other imports (Color, utils) are resolved to the current modules.
+    :return: Baseline nbt_parser and components_parser.
+    """
+    package = types.ModuleType("baseline_tools")
+    package.__path__ = []
+    sys.modules["baseline_tools"] = package
+    for name in ("Color", "utils"):
+        sys.modules[f"baseline_tools.{name}"] = importlib.import_module(f"tools.{name}")
+
+    modules = []
+    for name in ("nbt_parser", "components_parser"):
+        module = types.ModuleType(f"baseline_tools.{name}")
+        module.__package__ = "baseline_tools"
+        sys.modules[module.__name__] = module
+        source = git("show", f"{revision}:scripts/tools/{name}.py")
+        exec(compile(source, f"{revision}:{name}.py", "exec"), module.__dict__)
+        modules.append(module)
+    return modules[0], modules[1]
+
+
+def raw_component_values(components_module: types.ModuleType, input_str: str) -> list:
+    """
+    :return: Values of the components as strings, before they are decoded as nbt.
+    """
+    decoder = components_module.nbt_decoder
+    components_module.nbt_decoder = str
+    try:
+        return list(components_module.item_components_decoder(input_str).values())
+    finally:
+        components_module.nbt_decoder = decoder
+
+
+def collect_inputs(datapacks_path: Path) -> tuple[list[str], list[str]]:
+    """
+    Finds nbt of all give and summon commands in functions of datapacks.
+    :return: Components of give commands and nbt of summon commands.
+    """
+    components, nbts = set(), set()
+    for path in datapacks_path.rglob("*.mcfunction"):
+        content = path.read_text(encoding="utf-8", errors="replace")
+        for pattern in (
+            FunctionsReadPatterns.give_command,
+            FunctionsReadPatterns.give_command_trophy,
+        ):
+            match = re.search(pattern, content)
+            if match and match["components"]:
+                components.add(match["components"])
+        for pattern in (
+            FunctionsReadPatterns.summon_command,
+            FunctionsReadPatterns.summon_command_trophy,
+        ):
+            match = re.search(pattern, content)
+            if match:
+                nbts.add(match["nbt"])
+    return sorted(components), sorted(nbts)
+
+
+def try_call(function: Callable[[Any], Any], value: Any) -> Any:
+    try:
+        return function(value)
+    except ValueError as err:
+        return err
+
+
+def clear_caches() -> None:
+    nbt_parser._decode_cached.cache_clear()
+    components_parser._decode_cached.cache_clear()
+
+
+def measure(
+    function: Callable[[Any], Any],
+    values: list,
+    repeats: int,
+    setup: Callable[[], None] = None,
+) -> float:
+    """
+    :param setup: Called before each repeat, it isn't measured.
+    :return: The best time of calling the function for all values in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for value in values:
+            try_call(function, value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_times(name: str, legacy_time: float, new_time: float) -> None:
+    print(
+        f"{name}: legacy {legacy_time:.3f}s, new {new_time:.3f}s, "
+        f"x{legacy_time / new_time:.1f}"
+    )
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    revision = sys.argv[2] if len(sys.argv) > 2 else default_baseline()
+    revision = git("rev-parse", "--short", f"{revision}^{{commit}}").strip()
+    print(f"Baseline: {revision} {git('log', '-1', '--format=%s', revision).strip()}")
+    legacy_nbt, legacy_components = load_baseline(revision)
+
+    components, nbts = collect_inputs(Path("datapacks"))
+    # Values of components are decoded as nbt too
+    nbts += [
+        value
+        for input_str in components
+        for value in raw_component_values(legacy_components, input_str)
+    ]
+    print(
+        f"Inputs: {len(components)} components ({sum(map(len, components))} chars), "
+        f"{len(nbts)} nbt ({sum(map(len, nbts))} chars)"
+    )
+
+    cases = (
+        (
+            "components",
+            components,
+            (legacy_components.item_components_decoder, item_components_decoder),
+            (legacy_components.item_components_encoder, item_components_encoder),
+        ),
+        (
+            "nbt",
+            nbts,
+            (legacy_nbt.nbt_decoder, nbt_decoder),
+            (legacy_nbt.nbt_encoder, nbt_encoder),
+        ),
+    )
+    failed = 0
+    for name, inputs, (legacy_decoder, decoder), (legacy_encoder, encoder) in cases:
+        print_times(
+            f"{name} decoding",
+            measure(legacy_decoder, inputs, repeats),
+            measure(decoder, inputs, repeats, clear_caches),
+        )
+        print(f"{name} decoding, cached: {measure(decoder, inputs, repeats):.3f}s")
+
+        decoded = []
+        for input_str in inputs:
+            expected = try_call(legacy_decoder, input_str)
+            result = try_call(decoder, input_str)
+            if isinstance(expected, ValueError) and isinstance(result, ValueError):
+                continue
+            # repr distinguishes equal values of different types (True and 1, 1 and 1.0)
+            if repr(result) != repr(expected):
+                failed += 1
+                print(f"Different result: {input_str[:200]}")
+                continue
+            decoded.append(result)
+
+            encoded = encoder(result)
+            if encoded != legacy_encoder(result):
+                failed += 1
+                print(f"Different encoding: {input_str[:200]}")
+            elif repr(try_call(decoder, encoded)) != repr(result):
+                failed += 1
+                print(f"Doesn't round-trip: {input_str[:200]}")
+
+        print_times(
+            f"{name} encoding",
+            measure(legacy_encoder, decoded, repeats),
+            measure(encoder, decoded, repeats),
+        )
+
+    print(f"Failed: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
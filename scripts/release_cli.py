@@ -0,0 +1,204 @@
+"""
+Non-interactive check and release for build servers.
+Run from the root of the repository:
+    python scripts/release_cli.py check [--datapack NAME ...]
+    python scripts/release_cli.py release --version 1.2.3 [--datapack NAME ...] [--allow-warnings]
+
+The report with warnings and timings is printed to stdout as JSON (or written to --output),
+progress messages are printed to stderr.
+Exit code: 0 - success, 1 - warnings found, 2 - the release failed.
+"""
+
+import argparse
+import json
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+import tools.data_writer as dw
+from tools.Advancement import AdvancementsManager, BaseAdvancement
+from tools.Datapack import Datapack, DatapackList
+from tools.FileWriter import FileWriter
+from tools.Release import Release
+from tools.ReleasePipeline import PipelineCancelled, ReleasePipeline, Stage
+from tools.Warnings import AdvWarning
+
+EXIT_OK = 0
+EXIT_WARNINGS = 1
+EXIT_FAILED = 2
+
+
+def warnings_to_json(
+    advancements_warnings: list[tuple[BaseAdvancement, list[AdvWarning]]],
+) -> list[dict[str, str]]:
+    return [
+        {
+            "datapack": adv.datapack.name,
+            "advancement": adv.mc_path,
+            "path": adv.path.as_posix(),
+            "type": warning.warning_type.name,
+            "reason": warning.reason,
+        }
+        for adv, warnings in advancements_warnings
+        for warning in warnings
+    ]
+
+
+def check(datapacks: list[Datapack], report: dict[str, Any]) -> int:
+    AdvancementsManager.generate()
+    report["warnings"] = []
+    report["validation_time"] = {}
+    for datapack in datapacks:
+        advancements_warnings, timings = Release.collect_warnings(datapack)
+        report["warnings"] += warnings_to_json(advancements_warnings)
+        report["validation_time"][datapack.name] = timings
+    return EXIT_WARNINGS if report["warnings"] else EXIT_OK
+
+
+def release(
+    datapacks: list[Datapack], args: argparse.Namespace, report: dict[str, Any]
+) -> int:
+    AdvancementsManager.generate()
+    FileWriter.reset_counters()
+    # Warnings of a cancelled check stage, results of completed stages are in the pipeline
+    cancelled_checks: dict[str, list[dict[str, str]]] = {}
+
+    def check_stage(datapack: Datapack) -> Stage:
+        def check_datapack():
+            advancements_warnings, _ = Release.collect_warnings(datapack)
+            warnings = warnings_to_json(advancements_warnings)
+            if warnings and not args.allow_warnings:
+                cancelled_checks[datapack.name] = warnings
+                raise PipelineCancelled
+            return warnings
+
+        return Stage(
+            f"check {datapack.name}",
+            check_datapack,
+            ("format",),
+            f"{datapack.name}: Checked",
+            resources=(Release.advancements_resource,),
+        )
+
+    checks = [check_stage(datapack) for datapack in datapacks]
+    stages = [
+        *Release.generation_stages(datapacks),
+        *checks,
+        *Release.zip_stages(datapacks, lambda dp: args.version),
+    ]
+    if not args.no_data_json:
+        stages.append(
+            Stage(
+                "data.json",
+                lambda: dw.create(args.version),
+                tuple(stage.name for stage in checks),
+                "data.json has been updated",
+                resources=(Release.advancements_resource,),
+            )
+        )
+    pipeline = ReleasePipeline(stages, Release.pipeline_inputs(datapacks))
+
+    exit_code = EXIT_OK
+    try:
+        pipeline.run(resume=args.resume, workers=args.workers)
+    except PipelineCancelled:
+        exit_code = EXIT_WARNINGS
+    finally:
+        report["stage_time"] = pipeline.timings
+        report["files_written"], report["files_unchanged"] = (
+            FileWriter.reset_counters()
+        )
+        report["warnings"] = []
+        for stage in checks:
+            report["warnings"] += pipeline.results.get(stage.name) or []
+        for warnings in cancelled_checks.values():
+            report["warnings"] += warnings
+        report["archives"] = {
+            name: result
+            for name, result in pipeline.results.items()
+            if name.startswith(("zip ", "language pack "))
+        }
+    return exit_code
+
+
+def main() -> int:
+    available = {datapack.name: datapack for datapack in DatapackList.available}
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="validate advancements")
+    release_parser = subparsers.add_parser("release", help="generate files and zips")
+    release_parser.add_argument("-v", "--version", required=True)
+    release_parser.add_argument(
+        "--allow-warnings",
+        action="store_true",
+        help="create the release even if advancements have warnings",
+    )
+    release_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip stages completed by the last unfinished release",
+    )
+    release_parser.add_argument(
+        "--no-data-json", action="store_true", help="don't update the site data"
+    )
+    release_parser.add_argument(
+        "--workers", type=int, help="threads for concurrent stages"
+    )
+    for subparser in (check_parser, release_parser):
+        subparser.add_argument(
+            "-d",
+            "--datapack",
+            action="append",
+            choices=available,
+            help="datapack to process, can be repeated (work_with datapacks by default)",
+        )
+        subparser.add_argument(
+            "-o", "--output", type=Path, help="write the JSON report to the file"
+        )
+    args = parser.parse_args()
+
+    datapacks = (
+        [available[name] for name in args.datapack]
+        if args.datapack
+        else DatapackList.work_with
+    )
+    report: dict[str, Any] = {
+        "command": args.command,
+        "datapacks": [datapack.name for datapack in datapacks],
+    }
+    if args.command == "release":
+        report["version"] = args.version
+
+    start = time.perf_counter()
+    # Progress goes to stderr, stdout is kept for the report
+    with redirect_stdout(sys.stderr):
+        try:
+            if args.command == "check":
+                exit_code = check(datapacks, report)
+            else:
+                exit_code = release(datapacks, args, report)
+        except Exception as e:
+            traceback.print_exc()
+            report["error"] = f"{type(e).__name__}: {e}"
+            exit_code = EXIT_FAILED
+    report["time"] = time.perf_counter() - start
+    report["status"] = {
+        EXIT_OK: "ok",
+        EXIT_WARNINGS: "warnings",
+        EXIT_FAILED: "failed",
+    }[exit_code]
+
+    report_json = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(report_json + "\n", encoding="utf-8")
+    else:
+        print(report_json)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,17 @@
+import operator
 import os
+import sys
 from collections import defaultdict
+from collections.abc import Hashable
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
+from itertools import islice
 
 from . import Datapack
+from .Cache import PersistentCache
 from .Criteria import CriteriaList
+from .DirectoryScanner import DirectoryScanner
+from .FileWriter import FileWriter
 from .Functions import *
 from .Item import *
 from .Warnings import *
@@ -17,6 +25,19 @@ class BaseAdvancement:
     InvalidAdvancement, TechnicalAdvancement and Advancement.
     """
 
+    # Thousands of advancements are loaded at once, so instances have no __dict__
+    __slots__ = (
+        "_adv_json",
+        "_path",
+        "_datapack",
+        "_filename",
+        "_namespace",
+        "_mc_path",
+        "_reward_mcpath",
+        "_parent",
+        "_last_modified",
+    )
+
     def __init__(
         self,
         path: Path,
@@ -35,7 +56,9 @@ class BaseAdvancement:
         self._path = path
         self._datapack = datapack
         self._filename = path.stem
-        self._namespace = str(path.relative_to(datapack.path / "data").parts[0])
+        self._namespace = sys.intern(
+            str(path.relative_to(datapack.path / "data").parts[0])
+        )
         self._mc_path = path_to_mc_path(self.path)
         self._reward_mcpath = reward_mcpath
 
@@ -64,7 +87,8 @@ class BaseAdvancement:
             )
 
         self._adv_json["rewards"] = {"function": self._reward_mcpath}
-        self._path.write_text(json.dumps(self._adv_json, indent=2))
+        FileWriter.write_text(self._path, json.dumps(self._adv_json, indent=2))
+        AdvancementsManager.invalidate_indexes()
 
     @property
     def path(self) -> Path:
@@ -91,6 +115,7 @@ class BaseAdvancement:
         self._path.write_text(
             json.dumps(self.json, indent=2), encoding=self.datapack.encoding
         )
+        AdvancementsManager.invalidate_indexes()
 
     @property
     def datapack(self) -> Datapack:
@@ -111,7 +136,7 @@ class BaseAdvancement:
         Regenerated JSON with indents
         :return: None
         """
-        self._path.write_text(json.dumps(self.json, indent=2))
+        FileWriter.write_text(self._path, json.dumps(self.json, indent=2))
 
     @property
     def json(self) -> dict | None:
@@ -143,6 +168,7 @@ class BaseAdvancement:
         self._path.write_text(
             json.dumps(self.json, indent=2), encoding=self.datapack.encoding
         )
+        AdvancementsManager.invalidate_indexes()
 
     @property
     def mc_path(self) -> str:
@@ -196,6 +222,8 @@ class InvalidAdvancement(BaseAdvancement):
     Inherits from BaseAdvancement.
     """
 
+    __slots__ = ("_reason",)
+
     def __init__(
         self,
         path: Path,
@@ -233,6 +261,8 @@ class TechnicalAdvancement(BaseAdvancement):
     Inherits from BaseAdvancement.
     """
 
+    __slots__ = ()
+
     def __init__(self, path: Path, datapack: Datapack, adv_json):
         """
         Initializes a new instance of the TechnicalAdvancement class.
@@ -254,6 +284,20 @@ class Advancement(BaseAdvancement):
     Inherits from BaseAdvancement.
     """
 
+    __slots__ = (
+        "_tab",
+        "_color",
+        "_frame",
+        "_hidden",
+        "_type",
+        "_title",
+        "_description",
+        "_background",
+        "_icon",
+        "_criteria_list",
+        "_functions",
+    )
+
     tab_names = {
         "adventure": "Adventure",
         "animal": "Animals",
@@ -302,7 +346,7 @@ class Advancement(BaseAdvancement):
 
         super().__init__(path, datapack, adv_json, reward_mcpath)
 
-        self._tab = tab
+        self._tab = sys.intern(tab)
         self._color = Color(color)
         self._frame = frame
         self._hidden = hidden
@@ -314,8 +358,9 @@ class Advancement(BaseAdvancement):
             self._get_description_from_extra()
 
         self._background = self._adv_json["display"].get("background")
-        self._icon = Item(self._adv_json["display"]["icon"])
-        self._criteria_list = CriteriaList(self._adv_json["criteria"])
+        # Built from JSON on the first access, most commands don't need them
+        self._icon = None
+        self._criteria_list = None
         self._functions = Functions(self)
 
     def _get_description_from_extra(self):
@@ -350,7 +395,7 @@ class Advancement(BaseAdvancement):
             and self.datapack in DatapackList.work_with
         ):
             self._adv_json["rewards"] = {"function": self.reward_mcpath}
-        self._path.write_text(json.dumps(self.json, indent=2))
+        FileWriter.write_text(self._path, json.dumps(self.json, indent=2))
 
     @property
     def functions(self) -> Functions:
@@ -378,6 +423,7 @@ class Advancement(BaseAdvancement):
             json.dumps(self.json, indent=2), encoding=self.datapack.encoding
         )
         self._title = value
+        AdvancementsManager.invalidate_indexes()
         self.functions.msg.generate()
         self.functions.trophy.gen_from_selfdata()
 
@@ -427,6 +473,7 @@ class Advancement(BaseAdvancement):
             "frame"
         ]
         self._type = value
+        AdvancementsManager.invalidate_indexes()
 
         self._path.write_text(
             json.dumps(json_adv, indent=2), encoding=self.datapack.encoding
@@ -471,10 +518,11 @@ class Advancement(BaseAdvancement):
         )
         self.json["rewards"]["function"] = self._reward_mcpath
         self.functions.update_paths()
-        self._tab = cut_namespace(self._reward_mcpath).split("/")[0]
+        self._tab = sys.intern(cut_namespace(self._reward_mcpath).split("/")[0])
         self._path.write_text(
             json.dumps(self.json, indent=2), encoding=self.datapack.encoding
         )
+        AdvancementsManager.invalidate_indexes()
 
     @property
     def tab(self) -> str:
@@ -540,6 +588,8 @@ class Advancement(BaseAdvancement):
 
     @property
     def icon(self) -> Item:
+        if self._icon is None:
+            self._icon = Item(self._adv_json["display"]["icon"])
         return self._icon
 
     @property
@@ -547,6 +597,8 @@ class Advancement(BaseAdvancement):
         """
         Returns a 'CriteriaList' of criteria for the advancement
         """
+        if self._criteria_list is None:
+            self._criteria_list = CriteriaList(self._adv_json["criteria"])
         return self._criteria_list
 
     def __str__(self):
@@ -556,7 +608,24 @@ class Advancement(BaseAdvancement):
         return f"Advancement([{self.datapack}] {self.mc_path})"
 
 
+def _parse_adv_file(path: str) -> tuple[str, int, int, dict | None]:
+    """
+    Reads and parses an advancement file. Runs inside worker processes.
+    :param path: Path to the advancement file.
+    :return: Path, st_mtime_ns, st_size and JSON of the advancement.
+    """
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size, get_adv_json(Path(path))
+
+
 class AdvancementFactory:
+    # Parsed advancement JSONs from the previous runs, keyed by path.
+    # Each entry is (st_mtime_ns, st_size, adv_json)
+    # JSONs are interned, see intern_json
+    _snapshot = PersistentCache("advancements", 2)
+    # Don't start worker processes for fewer files, it's slower than parsing them here
+    _min_files_to_preload = 200
+
     @classmethod
     def load_advancement(
         cls, advancement_path: Path, datapack: Datapack, force: bool = False
@@ -570,7 +639,7 @@ class AdvancementFactory:
             and not cls._is_modified(advancement_path)
         ):
             return AdvancementsManager.adv_dict()[advancement_path]
-        adv_json = get_adv_json(advancement_path)
+        adv_json = cls._read_adv_json(advancement_path)
 
         if cls._is_not_parsable_json(adv_json):
             return InvalidAdvancement(
@@ -638,8 +707,73 @@ class AdvancementFactory:
             hidden,
         )
 
+    @classmethod
+    def _read_adv_json(cls, advancement_path: Path) -> dict | None:
+        """
+        Returns the advancement's JSON from the snapshot if the file wasn't changed,
+        else parses the file and updates the snapshot.
+        The JSON is a copy, advancements change it, and the snapshot must match the file.
+        """
+        if FileWriter.get_pending(advancement_path) is not None:
+            return get_adv_json(advancement_path)
+
+        stat = advancement_path.stat()
+        key = str(advancement_path)
+        if not cls._is_in_snapshot(key, stat):
+            adv_json = intern_json(get_adv_json(advancement_path))
+            cls._snapshot[key] = (stat.st_mtime_ns, stat.st_size, adv_json)
+        return copy_json(cls._snapshot[key][2])
+
+    @classmethod
+    def _is_in_snapshot(cls, key: str, stat: os.stat_result) -> bool:
+        cached = cls._snapshot.get(key)
+        return (
+            cached is not None
+            and cached[0] == stat.st_mtime_ns
+            and cached[1] == stat.st_size
+        )
+
+    @classmethod
+    def preload(cls, advancement_paths: Iterable[Path], workers: int) -> None:
+        """
+        Reads and parses changed advancement files in worker processes and puts them to the snapshot.
+        After that load_advancement only classifies them.
+        :param advancement_paths: Paths of advancements, which will be loaded.
+        :param workers: Number of worker processes.
+        :return: None
+        """
+        stale_paths = [
+            key
+            for key in map(str, advancement_paths)
+            if not cls._is_in_snapshot(key, os.stat(key))
+        ]
+        if len(stale_paths) < cls._min_files_to_preload:
+            return
+
+        chunksize = max(1, len(stale_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for key, mtime_ns, size, adv_json in executor.map(
+                _parse_adv_file, stale_paths, chunksize=chunksize
+            ):
+                # Strings are interned here, interned strings of workers aren't shared
+                cls._snapshot[key] = (mtime_ns, size, intern_json(adv_json))
+
+    @classmethod
+    def save_snapshot(cls, advancement_paths: Iterable[Path] = None) -> None:
+        """
+        Writes parsed advancements to the disk, so the next start doesn't parse them again.
+        :param advancement_paths: All existing advancement paths.
+        If set, entries for other paths will be dropped.
+        :return: None
+        """
+        if advancement_paths is not None:
+            cls._snapshot.retain(str(path) for path in advancement_paths)
+        cls._snapshot.save()
+
     @classmethod
     def _is_modified(cls, advancement_path: Path) -> bool:
+        if FileWriter.get_pending(advancement_path) is not None:
+            return True
         return AdvancementsManager.adv_dict()[
             advancement_path
         ].last_modified != os.path.getmtime(advancement_path)
@@ -682,6 +816,134 @@ class AdvancementFactory:
             adv.format_json()
 
 
+class AdvancementGraph:
+    """
+    Parent-child relations between advancements.
+    It's built once per version of AdvancementsManager (see AdvancementsManager.graph),
+    results of chain lookups are memoized.
+    """
+
+    def __init__(
+        self, advancements: Iterable[Advancement | TechnicalAdvancement]
+    ) -> None:
+        """
+        :param advancements: Valid advancements (including technical ones) in the list order.
+        """
+        # mc_path -> advancement, the last one wins
+        self._advancements: dict[str, Advancement | TechnicalAdvancement] = {}
+        # mc_path -> the first not technical advancement
+        self._normal_advancements: dict[str, Advancement] = {}
+        # mc_path of a parent -> children in the list order
+        self._children: dict[str, list[Advancement | TechnicalAdvancement]] = (
+            defaultdict(list)
+        )
+        for adv in advancements:
+            self._advancements[adv.mc_path] = adv
+            if isinstance(adv, Advancement):
+                self._normal_advancements.setdefault(adv.mc_path, adv)
+            if adv.parent:
+                self._children[adv.parent].append(adv)
+
+        self._tails: dict[str, Advancement | TechnicalAdvancement] = {}
+        self._depths: dict[str, int] = {}
+        self._roots: dict[int, Advancement | TechnicalAdvancement] = {}
+
+    def get(self, mc_path: str) -> Advancement | TechnicalAdvancement | None:
+        """
+        Returns the advancement with given mc_path. The last loaded one wins.
+        """
+        return self._advancements.get(mc_path)
+
+    def children(self, mc_path: str) -> list[Advancement | TechnicalAdvancement]:
+        """
+        Returns advancements, which parent is given mc_path.
+        """
+        return self._children.get(mc_path, [])
+
+    def has_children(self, mc_path: str) -> bool:
+        return mc_path in self._children
+
+    def _walk_up(self, mc_path: str) -> None:
+        """
+        Fills tails and depths of the chain starting from given mc_path.
+        """
+        chain = []
+        visited = set()
+        while (
+            mc_path in self._advancements
+            and mc_path not in self._tails
+            and mc_path not in visited
+        ):
+            chain.append(mc_path)
+            visited.add(mc_path)
+            mc_path = self._advancements[mc_path].parent
+
+        if mc_path in self._tails:
+            tail, depth = self._tails[mc_path], self._depths[mc_path]
+        else:
+            # The chain ends here, or it's a loop of parents
+            tail, depth = self._advancements[chain[-1]], -1
+
+        for chain_mc_path in reversed(chain):
+            depth += 1
+            self._tails[chain_mc_path] = tail
+            self._depths[chain_mc_path] = depth
+
+    def tail(
+        self, adv: Advancement | TechnicalAdvancement
+    ) -> Advancement | TechnicalAdvancement:
+        """
+        Follows the parent chain of the advancement until a parent doesn't exist.
+        :param adv: The starting advancement.
+        :return: The last advancement in the chain.
+        """
+        if adv.parent not in self._advancements:
+            return adv
+        if adv.parent not in self._tails:
+            self._walk_up(adv.parent)
+        return self._tails[adv.parent]
+
+    def depth(self, adv: Advancement | TechnicalAdvancement) -> int:
+        """
+        Returns the number of parents in the chain of the advancement.
+        """
+        if adv.parent not in self._advancements:
+            return 0
+        if adv.parent not in self._depths:
+            self._walk_up(adv.parent)
+        return self._depths[adv.parent] + 1
+
+    def root(
+        self, adv: Advancement | TechnicalAdvancement
+    ) -> Advancement | TechnicalAdvancement:
+        """
+        Follows parents of the advancement until a not hidden advancement is found.
+        Technical advancements are skipped as parents.
+        """
+        root = self._roots.get(id(adv))
+        if root is None:
+            root = adv
+            visited = set()
+            while getattr(root, "hidden", False) and id(root) not in visited:
+                visited.add(id(root))
+                parent = self._normal_advancements.get(root.parent)
+                if parent is None:
+                    break
+                root = parent
+            self._roots[id(adv)] = root
+        return root
+
+    def is_in_branch(self, adv: Advancement | TechnicalAdvancement) -> bool:
+        """
+        Checks if the advancement belongs to a branch:
+        its chain or the not hidden root of the chain has children.
+        """
+        tail = self.tail(adv)
+        return self.has_children(tail.mc_path) or self.has_children(
+            self.root(tail).mc_path
+        )
+
+
 class AdvManagerMeta(type):
     _advancements_list = None
     _advancements_dict = None
@@ -690,9 +952,9 @@ class AdvManagerMeta(type):
         cls, key
     ) -> InvalidAdvancement | TechnicalAdvancement | Advancement:
         if isinstance(key, int):
-            return cls._advancements_dict[key]
+            return cls._advancements_list[key]
         elif isinstance(key, Path):
-            return cls._advancements_list.get(key)
+            return cls._advancements_dict[key]
         else:
             raise KeyError("Key must be an int (list index) or Path object")
 
@@ -719,17 +981,107 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
     _advancements_list: list[
         Advancement | InvalidAdvancement | TechnicalAdvancement
     ] = []
+    _watcher = None
+
+    # Attributes, which have hash indexes for find()
+    _indexed_attributes = frozenset(
+        ("mc_path", "filename", "title", "reward_mcpath", "tab", "type", "datapack")
+    )
+    # Attribute -> value -> advancements in the list order. Built lazily by _get_index
+    _indexes: dict[
+        str, dict[Any, list[Advancement | InvalidAdvancement | TechnicalAdvancement]]
+    ] = {}
+    # Increased on every change of advancements, so derived data can be rebuilt
+    _version = 0
+    _graph: AdvancementGraph | None = None
 
     @classmethod
     def _generate_adv(cls):
-        for datapack in DatapackList.available:
-            for adv_paths in datapack.advancement_paths:
-                for adv_path in adv_paths.rglob("*.json"):
-                    if adv_path.is_file() and not datapack.is_excluded(adv_path):
-                        cls._advancements_dict[adv_path] = (
-                            AdvancementFactory.load_advancement(adv_path, datapack)
-                        )
-        cls._advancements_list = list(cls._advancements_dict.values())
+        adv_paths = [
+            (adv_path, datapack)
+            for datapack in DatapackList.available
+            for adv_folder in datapack.advancement_paths
+            for adv_path in DirectoryScanner.walk_files(adv_folder, ".json")
+            if not datapack.is_excluded(adv_path)
+        ]
+
+        workers = get_workers_setting("load_workers")
+        if workers > 1:
+            AdvancementFactory.preload((path for path, _ in adv_paths), workers)
+
+        # Rebuilt from the scan, so advancements of deleted files are dropped.
+        # Unchanged advancements are taken from the current dict by load_advancement
+        with Functions.prescanned(DatapackList.available):
+            advancements_dict = {
+                adv_path: AdvancementFactory.load_advancement(adv_path, datapack)
+                for adv_path, datapack in adv_paths
+            }
+        cls._set_advancements(advancements_dict)
+        AdvancementFactory.save_snapshot(cls._advancements_dict.keys())
+
+    @classmethod
+    def _set_advancements(
+        cls,
+        advancements_dict: dict[
+            Path, Advancement | InvalidAdvancement | TechnicalAdvancement
+        ],
+    ) -> None:
+        """
+        Replaces advancements and invalidates indexes if something has changed.
+        """
+        old_dict = cls._advancements_dict
+        cls._advancements_dict = advancements_dict
+        if advancements_dict.keys() == old_dict.keys() and all(
+            map(operator.is_, advancements_dict.values(), old_dict.values())
+        ):
+            return
+        cls._advancements_list = list(advancements_dict.values())
+        cls.invalidate_indexes()
+
+    @classmethod
+    def invalidate_indexes(cls) -> None:
+        """
+        Drops indexes of advancements.
+        Must be called after changing an indexed attribute of an advancement.
+        :return: None
+        """
+        cls._indexes.clear()
+        cls._graph = None
+        cls._version += 1
+
+    @classmethod
+    def version(cls) -> int:
+        """
+        Returns a number, which is increased on every change of advancements.
+        """
+        return cls._version
+
+    @classmethod
+    def graph(cls) -> AdvancementGraph:
+        """
+        Returns parent-child relations of valid advancements of available datapacks.
+        It's rebuilt only after advancements have been changed.
+        """
+        if cls._graph is None:
+            cls._graph = AdvancementGraph(
+                cls.filtered_iterator(
+                    datapack=DatapackList.available, skip_technical=False
+                )
+            )
+        return cls._graph
+
+    @classmethod
+    def _get_index(
+        cls, attr: str
+    ) -> dict[Any, list[Advancement | InvalidAdvancement | TechnicalAdvancement]]:
+        index = cls._indexes.get(attr)
+        if index is None:
+            index = defaultdict(list)
+            for adv in cls._advancements_list:
+                if hasattr(adv, attr):
+                    index[getattr(adv, attr)].append(adv)
+            cls._indexes[attr] = index
+        return index
 
     @classmethod
     def adv_list(cls) -> list[Advancement | InvalidAdvancement | TechnicalAdvancement]:
@@ -781,8 +1133,26 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         """
         Return Iterator of advancements by parameters.
         """
+        return cls._filter(
+            cls._advancements_list,
+            datapack,
+            skip_invalid,
+            skip_technical,
+            skip_normal,
+        )
+
+    @classmethod
+    def _filter(
+        cls,
+        advancements: Iterable[Advancement | InvalidAdvancement | TechnicalAdvancement],
+        datapack: Iterable[Datapack] | Datapack,
+        skip_invalid: bool,
+        skip_technical: bool,
+        skip_normal: bool,
+    ) -> Iterator[Advancement | InvalidAdvancement | TechnicalAdvancement]:
         datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
-        for adv in cls._advancements_list:
+        datapack = set(datapack)
+        for adv in advancements:
             if datapack and (adv.datapack not in datapack):
                 continue
             if cls.__advancement_type_skip_check(
@@ -807,12 +1177,29 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         :param skip_technical: Skip technical Advancement if True.
         :param skip_invalid: Skip invalid Advancement if True.
         :param criteria: A dict, where key is attribute, value is expected value.
+        Value also can be callable, which gets the attribute and returns True if it fits.
         :param datapack: The datapack.
         :param limit: How many find advancements. None if no limit
         :param invert: Invert find.
         If True, advancement, which fits the criteria, doesn't be added.
         :return: Instance of Advancement
         """
+        if len(criteria) == 1 and not invert:
+            ((attr, value),) = criteria.items()
+            if (
+                attr in cls._indexed_attributes
+                and isinstance(value, Hashable)
+                and not callable(value)
+            ):
+                iterator = cls._filter(
+                    cls._get_index(attr).get(value, ()),
+                    datapack,
+                    skip_invalid,
+                    skip_technical,
+                    skip_normal,
+                )
+                return list(islice(iterator, limit or None))
+
         iterator = cls.filtered_iterator(
             datapack, skip_invalid, skip_technical, skip_normal
         )
@@ -822,7 +1209,10 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
             if limit and count >= limit:
                 break
             for attr, value in criteria.items():
-                if (getattr(adv, attr) == value) == invert:
+                attr_value = getattr(adv, attr)
+                if callable(value) and value(attr_value) == invert:
+                    continue
+                elif not callable(value) and (attr_value == value) == invert:
                     continue
                 count += 1
                 advancement_list.append(adv)
@@ -854,8 +1244,7 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         :return: Instance of Advancement
         """
 
-        def iterative_getattr(obj, attr):
-            return reduce(getattr, attr.split("."), obj)
+        attr_chains = [(attr.split("."), value) for attr, value in criteria.items()]
 
         iterator = cls.filtered_iterator(
             datapack, skip_invalid, skip_technical, skip_normal
@@ -865,8 +1254,8 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         for adv in iterator:
             if limit and count >= limit:
                 break
-            for criteria_attr, value in criteria.items():
-                attr_value = iterative_getattr(adv, criteria_attr)
+            for attr_chain, value in attr_chains:
+                attr_value = reduce(getattr, attr_chain, adv)
 
                 if callable(value) and value(attr_value) == invert:
                     continue
@@ -888,20 +1277,97 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         :param adv: Advancement to remove
         :return: None
         """
-        cls._advancements_dict.pop(adv.path)
+        advancements_dict = dict(cls._advancements_dict)
+        advancements_dict.pop(adv.path)
+        cls._set_advancements(advancements_dict)
 
     @classmethod
     def generate(cls, force: bool = False) -> None:
         """
-        Update All instances from files
+        Update All instances from files.
+        Only new and changed files are loaded, advancements of deleted files are removed.
 
         :param force: Clears the cache
         :return: None
         """
         if force:
             cls._advancements_dict.clear()
+        elif cls._watcher is not None and cls._watcher.flush():
+            # The watcher has already applied all changes, scanning isn't needed
+            return
         cls._generate_adv()
 
+    @classmethod
+    def set_watcher(cls, watcher) -> None:
+        """
+        Sets a file watcher (see FileWatcher), which keeps advancements up to date.
+        While it's set, generate() only applies changes collected by the watcher.
+        :param watcher: Object with flush() method, which returns False if a full rescan is needed.
+        None to remove the watcher.
+        :return: None
+        """
+        cls._watcher = watcher
+
+    @classmethod
+    def update_paths(cls, paths: Iterable[Path]) -> None:
+        """
+        Updates advancements and function files by changed paths,
+        without scanning all datapacks.
+        Paths can be created, modified or deleted files, or deleted folders.
+        :param paths: Changed paths.
+        :return: None
+        """
+        advancements_dict = dict(cls._advancements_dict)
+        changed_reward_mcpaths = set()
+
+        for path in paths:
+            for datapack in DatapackList.available:
+                if path.suffix == ".json" and any(
+                    path.is_relative_to(folder) for folder in datapack.advancement_paths
+                ):
+                    if datapack.is_excluded(path):
+                        break
+                    if path.is_file():
+                        advancements_dict[path] = AdvancementFactory.load_advancement(
+                            path, datapack
+                        )
+                    else:
+                        advancements_dict.pop(path, None)
+                    break
+
+                if path.suffix == ".mcfunction" and path.is_relative_to(
+                    datapack.reward_path
+                ):
+                    Functions.update_file_state(path)
+                    changed_reward_mcpaths.add(
+                        cls._function_path_to_reward_mcpath(path, datapack)
+                    )
+                    break
+
+                if path.is_relative_to(datapack.path) and not path.exists():
+                    # A deleted or moved folder
+                    for adv_path in list(advancements_dict):
+                        if adv_path.is_relative_to(path):
+                            del advancements_dict[adv_path]
+                    break
+
+        cls._set_advancements(advancements_dict)
+
+        if changed_reward_mcpaths:
+            for adv in cls._advancements_list:
+                if (
+                    isinstance(adv, Advancement)
+                    and adv.reward_mcpath in changed_reward_mcpaths
+                ):
+                    adv.functions.reload()
+
+    @staticmethod
+    def _function_path_to_reward_mcpath(path: Path, datapack: Datapack) -> str:
+        parts = path.relative_to(datapack.reward_path).with_suffix("").parts
+        if parts[0] in ("exp", "msg", "reward", "trophy"):
+            parts = parts[1:]
+        return f"{datapack.reward_namespace}:{'/'.join(parts)}"
+
     @classmethod
     def update_advancement(
         cls, path: Path, datapack: Datapack, force: bool = False
@@ -913,10 +1379,12 @@ class AdvancementsManager(metaclass=AdvManagerMeta):
         :param force: Force Advancementlist to re-create the advancement and ignore caching (useful if you update only reward/trophy files)
         :return: None
         """
-        cls._advancements_dict[path] = AdvancementFactory.load_advancement(
-            path, datapack, force
+        cls._set_advancements(
+            {
+                **cls._advancements_dict,
+                path: AdvancementFactory.load_advancement(path, datapack, force),
+            }
         )
-        cls._advancements_list = list(cls._advancements_dict.values())
 
     @classmethod
     def split_by_tabs(
@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher. Finds all occurrences of all patterns in one pass over a text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        :param patterns: Patterns to search. Empty patterns are ignored.
+        """
+        self._patterns = list(patterns)
+        # Node -> char -> next node, node 0 is the root
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Node -> indexes of patterns, which end in this node (including ones reached by fail links)
+        self._outputs: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(self._patterns):
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = next_node
+            self._outputs[node].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_node] = fail
+                self._outputs[next_node] = (
+                    self._outputs[next_node] + self._outputs[fail]
+                )
+
+    @property
+    def patterns(self) -> list[str]:
+        return self._patterns
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """
+        Yields all occurrences of patterns, overlapping ones included, ordered by their end.
+        :param text: Text to search in.
+        :return: Iterator of (start, end, pattern index).
+        """
+        goto, fail, outputs, patterns = (
+            self._goto,
+            self._fail,
+            self._outputs,
+            self._patterns,
+        )
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in outputs[node]:
+                yield end - len(patterns[index]), end, index
+
+    def find_indexes(self, text: str) -> set[int]:
+        """
+        Returns indexes of patterns, which occur in the text.
+        """
+        return {index for _, _, index in self.iter_matches(text)}
+
+    def remove_all(self, text: str) -> str:
+        """
+        Removes patterns from the text one by one in their order.
+        The result is the same as of `text.replace(pattern, "")` for each pattern,
+        but only patterns, which occur in the text, are replaced.
+        :param text: Text to remove patterns from.
+        :return: Text without patterns.
+        """
+        next_index = 0
+        while True:
+            # A replacement can join parts of the text into a new occurrence, so search again after it
+            indexes = [index for index in self.find_indexes(text) if index >= next_index]
+            if not indexes:
+                return text
+            next_index = min(indexes)
+            text = text.replace(self._patterns[next_index], "")
+            next_index += 1
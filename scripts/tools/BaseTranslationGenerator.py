@@ -6,6 +6,7 @@ from pathlib import Path
 import jsoncomment
 
 from . import Datapack
+from .FileWriter import FileWriter
 
 
 class BaseTranslationGenerator:
@@ -28,7 +29,9 @@ class BaseTranslationGenerator:
             )
 
             # Write the new JSON string to the file, overwriting it completely
-            dp.base_translation_path.write_text(data=json_string, encoding=dp.encoding)
+            FileWriter.write_text(
+                dp.base_translation_path, json_string, encoding=dp.encoding
+            )
 
     @staticmethod
     def _load_json_from_file(file_path: Path, encoding: str):
@@ -0,0 +1,102 @@
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+CACHE_DIR = Path(".cache")
+
+
+class PersistentCache:
+    """
+    Dict-like cache, which is stored as a pickle file in the cache directory.
+    The whole file is dropped if it was written by another cache version.
+    """
+
+    def __init__(self, name: str, version: int = 1):
+        """
+        :param name: Name of the cache file (without suffix).
+        :param version: Version of the stored data format.
+        """
+        self._path = CACHE_DIR / f"{name}.pickle"
+        self._version = version
+        self._data: dict[str, Any] | None = None
+        self._dirty = False
+        self._save_lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """
+        Returns the cached entries, loading them from the disk on first access.
+        """
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+
+    def _load(self) -> dict[str, Any]:
+        if not self._path.exists():
+            return {}
+        try:
+            with self._path.open("rb") as f:
+                version, data = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return {}
+        if version != self._version or not isinstance(data, dict):
+            return {}
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        self._dirty = True
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """
+        Removes all entries, which keys are not in `keys`.
+        :param keys: Keys to keep.
+        :return: None
+        """
+        keys = set(keys)
+        for key in [key for key in self.data if key not in keys]:
+            del self[key]
+
+    def clear(self) -> None:
+        self._data = {}
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Writes the cache to the disk if it has been changed.
+        :return: None
+        """
+        with self._save_lock:
+            if not self._dirty or self._data is None:
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temporary file, so caches saved at the same time don't overwrite it
+            tmp_path = self._path.with_name(
+                f".{self._path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            try:
+                with tmp_path.open("wb") as f:
+                    pickle.dump((self._version, self._data), f, pickle.HIGHEST_PROTOCOL)
+                tmp_path.replace(self._path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            self._dirty = False
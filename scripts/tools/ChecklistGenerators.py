@@ -2,6 +2,8 @@ import pathlib
 from dataclasses import dataclass
 from typing import Optional
 
+from .FileWriter import FileWriter
+
 @dataclass
 class ChecklistCategory:
     """
@@ -100,7 +102,7 @@ class BaseChecklistGenerator:
         trigger_lines.extend(tellraws)
         trigger_lines.append(f"scoreboard players set @s {self.trigger_name} 0")
 
-        trigger_path.write_text("\n".join(trigger_lines), encoding="utf-8")
+        FileWriter.write_text(trigger_path, "\n".join(trigger_lines), encoding="utf-8")
 
         # GENERATE CHECK FILES
         check_dir = self.base_path / "function" / check_folder
@@ -111,7 +113,7 @@ class BaseChecklistGenerator:
             check_file_path = check_dir / check_filename
 
             check_cmd = self._generate_advancement_check_command(cat.mobs, cat.advancement)
-            check_file_path.write_text(check_cmd, encoding="utf-8")
+            FileWriter.write_text(check_file_path, check_cmd, encoding="utf-8")
 
 
 class MobUniverseGenerator(BaseChecklistGenerator):
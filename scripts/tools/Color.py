@@ -2,6 +2,8 @@ from .Resources import TextColors
 
 
 class Color:
+    __slots__ = ("_color",)
+
     def __init__(self, color: str):
         self._color = color
 
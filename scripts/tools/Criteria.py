@@ -5,6 +5,8 @@ from .utils import cut_namespace
 
 
 class Criteria:
+    __slots__ = ("_name", "_trigger", "_is_impossible")
+
     def __init__(self, name: str, trigger: str):
         self._name = name
         self._trigger = cut_namespace(trigger)
@@ -40,6 +42,8 @@ class Criteria:
 
 
 class CriteriaList(list):
+    __slots__ = ()
+
     def __init__(
         self,
         adv_criteria: Union[dict, Criteria, list, "CriteriaList", None] = None,
@@ -160,6 +160,9 @@ class Datapack:
             self.default_advancements_path / excluded_folder
             for excluded_folder in config["excluded_paths"]
         ]
+        # Parts are compared instead of Path.is_relative_to, it's called for every advancement
+        self._technical_paths_parts = [path.parts for path in self._technical_paths]
+        self._excluded_paths_parts = [path.parts for path in self._excluded_paths]
 
         if config.get("use_default_msg", True):
             self._msg_patterns_path = (
@@ -183,14 +186,18 @@ class Datapack:
             (path_to_config_folder / "ignore_adv_gen.json").read_text(encoding="utf-8")
         )
 
-    def is_technical(self, path):
+    def is_technical(self, path: Path) -> bool:
+        parts = path.parts
         return any(
-            path.is_relative_to(tech_folder) for tech_folder in self.technical_paths
+            parts[: len(tech_parts)] == tech_parts
+            for tech_parts in self._technical_paths_parts
         )
 
-    def is_excluded(self, path):
+    def is_excluded(self, path: Path) -> bool:
+        parts = path.parts
         return any(
-            path.is_relative_to(excl_folder) for excl_folder in self.excluded_paths
+            parts[: len(excl_parts)] == excl_parts
+            for excl_parts in self._excluded_paths_parts
         )
 
     def resolve_adv_type(
@@ -394,6 +401,9 @@ class Datapack:
     def __eq__(self, other: "Datapack") -> bool:
         return self.name == other.name and self.path == other.path
 
+    def __hash__(self) -> int:
+        return hash((self.name, self.path))
+
     def is_bacap(self) -> bool:
         return self == DatapackList.bacap
 
@@ -1,14 +1,31 @@
 import json
 from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
 from .Advancement import AdvancementsManager, Advancement
 from .Datapack import DatapackList, Datapack
+from .FileWriter import FileWriter
 from .Patterns import DatapackFunctionsWritePatterns
 from .utils import fill_pattern, cut_namespace
 
 
+@dataclass(frozen=True, slots=True)
+class FunctionsProjection:
+    """
+    Data of a datapack's advancements, which is needed to generate its functions.
+    Lists are sorted by mc_path, except types.
+    """
+
+    mc_paths: list[str]
+    visible_mc_paths: list[str]
+    # (mc_path, type) in the load order of advancements (see DirectoryScanner)
+    types: list[tuple[str, str]]
+    # (mc_path, reward_mcpath) of advancements with a trophy
+    trophies: list[tuple[str, str]]
+
+
 class DatapackFunctionsGenerator:
     _bacap_teams: tuple[str, ...] = (
         "aqua",
@@ -37,172 +54,183 @@ class DatapackFunctionsGenerator:
         tag = {"replace": False, "values": [f"{function_mc_path}"]}
 
         tag_path.parent.mkdir(parents=True, exist_ok=True)
-        tag_path.write_text(json.dumps(tag, indent=4), encoding=encoding)
+        FileWriter.write_text(tag_path, json.dumps(tag, indent=4), encoding=encoding)
 
-    @classmethod
-    def generate_update_score(cls, datapack: Datapack | Iterable[Datapack]):
+    @staticmethod
+    def _project(datapack: Datapack, trophies: bool = True) -> FunctionsProjection:
+        """
+        Collects data of all advancements of the datapack in a single pass.
+        :param trophies: Parse trophy functions to collect advancements with a trophy.
+        """
+        loaded: list[Advancement] = list(
+            AdvancementsManager.filtered_iterator(datapack=datapack)
+        )
+        advancements = sorted(loaded)
+        return FunctionsProjection(
+            mc_paths=[adv.mc_path for adv in advancements],
+            visible_mc_paths=[adv.mc_path for adv in advancements if not adv.hidden],
+            types=[(adv.mc_path, adv.type) for adv in loaded],
+            trophies=[
+                (adv.mc_path, adv.reward_mcpath)
+                for adv in advancements
+                if trophies and adv.functions.trophy.item
+            ],
+        )
 
-        datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
+    @staticmethod
+    def _render(lines: Iterable[str]) -> str:
+        return "".join(f"{line}\n" for line in lines)
 
-        for dp in datapack:
-            dp_update_score_path = dp.reward_path / "update_score.mcfunction"
+    @classmethod
+    def _write_function(
+        cls,
+        datapack: Datapack,
+        path: Path,
+        tag: str,
+        function_mc_path: str,
+        content: str,
+    ):
+        """
+        Writes the function and its tag in the fanpacks namespace.
+        :param tag: Path of the tag inside tags/function without suffix.
+        """
+        cls._update_function_tag(
+            tag_path=datapack.path
+            / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/{tag}.json",
+            function_mc_path=function_mc_path,
+            encoding=datapack.encoding,
+        )
+        FileWriter.write_text(path, content, encoding=datapack.encoding)
 
-            dp_update_score = ""
+    @classmethod
+    def _write_update_score(cls, dp: Datapack, projection: FunctionsProjection):
+        cls._write_function(
+            dp,
+            dp.reward_path / "update_score.mcfunction",
+            "update_score",
+            f"{dp.reward_namespace}:update_score",
+            cls._render(
+                fill_pattern(
+                    DatapackFunctionsWritePatterns.update_score,
+                    {"adv_path_in_mc": mc_path},
+                )
+                for mc_path in projection.visible_mc_paths
+            ),
+        )
 
-            adv_mc_paths = sorted(
-                set(
-                    adv.mc_path
-                    for adv in AdvancementsManager.filtered_iterator(datapack=dp)
-                    if not adv.hidden
+    @classmethod
+    def _write_update_points(cls, dp: Datapack, projection: FunctionsProjection):
+        cls._write_function(
+            dp,
+            dp.reward_path / "update_points.mcfunction",
+            "update_points",
+            f"{dp.reward_namespace}:update_points",
+            cls._render(
+                fill_pattern(
+                    DatapackFunctionsWritePatterns.update_points,
+                    {"adv_path_in_mc": mc_path, "adv_type": adv_type},
                 )
-            )
+                for mc_path, adv_type in projection.types
+            ),
+        )
 
-            for mc_path in adv_mc_paths:
-                dp_update_score += f"{fill_pattern(DatapackFunctionsWritePatterns.update_score, {'adv_path_in_mc': mc_path})}\n"
+    @classmethod
+    def _write_coop_update(cls, dp: Datapack, projection: FunctionsProjection):
+        cls._write_function(
+            dp,
+            dp.function_path / "config" / "coop_update.mcfunction",
+            "config/coop_update",
+            f"{dp.default_adv_namespace}:config/coop_update",
+            cls._render(
+                fill_pattern(
+                    DatapackFunctionsWritePatterns.coop_update,
+                    {"adv_path_in_mc": mc_path},
+                )
+                for mc_path in projection.mc_paths
+            ),
+        )
 
-            cls._update_function_tag(
-                tag_path=dp.path
-                / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/update_score.json",
-                function_mc_path=f"{dp.reward_namespace}:update_score",
-                encoding=dp.encoding,
+    @classmethod
+    def _write_coop_update_team(cls, dp: Datapack, projection: FunctionsProjection):
+        for color in cls._bacap_teams:
+            cls._write_function(
+                dp,
+                dp.function_path / f"config/coop_update_team_{color}.mcfunction",
+                f"config/coop_update_team_{color}",
+                f"{dp.default_adv_namespace}:config/coop_update_team_{color}",
+                cls._render(
+                    fill_pattern(
+                        DatapackFunctionsWritePatterns.coop_update_team,
+                        {"adv_path_in_mc": mc_path, "color_team": color},
+                    )
+                    for mc_path in projection.mc_paths
+                ),
             )
 
-            dp_update_score_path.write_text(dp_update_score, encoding=dp.encoding)
-
     @classmethod
-    def generate_update_points(cls, datapack: Datapack | Iterable[Datapack]):
+    def _write_grant_trophies(cls, dp: Datapack, projection: FunctionsProjection):
+        cls._write_function(
+            dp,
+            dp.function_path / "config/grant_trophies.mcfunction",
+            "config/grant_trophies",
+            f"{dp.default_adv_namespace}:config/grant_trophies",
+            cls._render(
+                fill_pattern(
+                    DatapackFunctionsWritePatterns.grant_trophies,
+                    {
+                        "adv_path_in_mc": mc_path,
+                        "internal_name": reward_mcpath,
+                        "reward_namespace": dp.reward_namespace,
+                        "reward_path": cut_namespace(reward_mcpath),
+                    },
+                )
+                for mc_path, reward_mcpath in projection.trophies
+            ),
+        )
 
+    @classmethod
+    def generate_update_score(cls, datapack: Datapack | Iterable[Datapack]):
         datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
-
         for dp in datapack:
-            dp_update_points_path = dp.reward_path / "update_points.mcfunction"
-
-            dp_update_points = ""
-
-            for adv in AdvancementsManager.filtered_iterator(datapack=dp):
-                adv: Advancement
-                dp_update_points += f"{fill_pattern(DatapackFunctionsWritePatterns.update_points, {'adv_path_in_mc': adv.mc_path, 'adv_type': adv.type})}\n"
+            cls._write_update_score(dp, cls._project(dp, trophies=False))
 
-            cls._update_function_tag(
-                tag_path=dp.path
-                         / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/update_points.json",
-                function_mc_path=f"{dp.reward_namespace}:update_points",
-                encoding=dp.encoding,
-            )
-
-            dp_update_points_path.write_text(dp_update_points, encoding=dp.encoding)
+    @classmethod
+    def generate_update_points(cls, datapack: Datapack | Iterable[Datapack]):
+        datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
+        for dp in datapack:
+            cls._write_update_points(dp, cls._project(dp, trophies=False))
 
     @classmethod
     def generate_coop_update(cls, datapack: Datapack | Iterable[Datapack]):
-
         datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
-
         for dp in datapack:
-            dp_coop_update_path = dp.function_path / "config" / "coop_update.mcfunction"
-
-            adv_mc_paths = sorted(
-                set(
-                    adv.mc_path
-                    for adv in AdvancementsManager.filtered_iterator(datapack=dp)
-                )
-            )
-
-            dp_coop_update = ""
-
-            for mc_path in adv_mc_paths:
-                dp_coop_update += f"{fill_pattern(DatapackFunctionsWritePatterns.coop_update, {'adv_path_in_mc': mc_path})}\n"
-
-            cls._update_function_tag(
-                tag_path=dp.path
-                / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/config/coop_update.json",
-                function_mc_path=f"{dp.default_adv_namespace}:config/coop_update",
-                encoding=dp.encoding,
-            )
-            dp_coop_update_path.write_text(dp_coop_update, encoding=dp.encoding)
+            cls._write_coop_update(dp, cls._project(dp, trophies=False))
 
     @classmethod
     def generate_coop_update_team(cls, datapack: Datapack | Iterable[Datapack]):
-
         datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
-
         for dp in datapack:
-            for color in cls._bacap_teams:
-                dp_coop_update_team_path = (
-                    dp.function_path / f"config/coop_update_team_{color}.mcfunction"
-                )
-
-                dp_coop_update_team = ""
-
-                adv_mc_paths = sorted(
-                    set(
-                        adv.mc_path
-                        for adv in AdvancementsManager.filtered_iterator(datapack=dp)
-                    )
-                )
-
-                for mc_path in adv_mc_paths:
-                    dp_coop_update_team += f"{fill_pattern(DatapackFunctionsWritePatterns.coop_update_team, {'adv_path_in_mc': mc_path, 'color_team': color})}\n"
-
-                cls._update_function_tag(
-                    tag_path=dp.path
-                    / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/config/coop_update_team_{color}.json",
-                    function_mc_path=f"{dp.default_adv_namespace}:config/coop_update_team_{color}",
-                    encoding=dp.encoding,
-                )
-                dp_coop_update_team_path.write_text(
-                    dp_coop_update_team, encoding=dp.encoding
-                )
+            cls._write_coop_update_team(dp, cls._project(dp, trophies=False))
 
     @classmethod
     def generate_grant_trophies(cls, datapack: Datapack | Iterable[Datapack]):
-
         datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
-
         for dp in datapack:
-            adv_with_trophies_data = [
-                adv
-                for adv in AdvancementsManager.deep_find(
-                    {"functions": lambda functions: bool(functions.trophy.item)},
-                    datapack=dp,
-                )
-            ]
-            adv_with_trophies_data.sort()
-
-            dp_grant_trophies_path = (
-                dp.function_path / "config/grant_trophies.mcfunction"
-            )
-
-            dp_grant_trophies = ""
-
-            for adv in adv_with_trophies_data:
-                dp_grant_trophies += f"{
-                    fill_pattern(
-                        DatapackFunctionsWritePatterns.grant_trophies,
-                        {
-                            'adv_path_in_mc': adv.mc_path,
-                            'internal_name': adv.reward_mcpath,
-                            'reward_namespace': adv.datapack.reward_namespace,
-                            'reward_path': cut_namespace(adv.reward_mcpath),
-                        },
-                    )
-                }\n"
-
-            cls._update_function_tag(
-                tag_path=dp.path
-                / f"data/{DatapackList.bacap.fanpacks_namespace}/tags/function/config/grant_trophies.json",
-                function_mc_path=f"{dp.default_adv_namespace}:config/grant_trophies",
-                encoding=dp.encoding,
-            )
-
-            dp_grant_trophies_path.write_text(dp_grant_trophies, encoding=dp.encoding)
+            cls._write_grant_trophies(dp, cls._project(dp))
 
     @classmethod
     def generate_all(cls, datapack: Datapack | List[Datapack]):
         """
         Generates all functions for datapack (update_score, coop_update, coop_team_update, grant_trophies)
+        Advancements of each datapack are collected once and all functions are rendered from them.
+        Files are changed only if all of them have been generated.
         """
-        cls.generate_update_score(datapack)
-        cls.generate_coop_update(datapack)
-        cls.generate_coop_update_team(datapack)
-        cls.generate_grant_trophies(datapack)
-        cls.generate_update_points(datapack)
+        datapack = datapack if isinstance(datapack, Iterable) else (datapack,)
+        with FileWriter.transaction():
+            for dp in datapack:
+                projection = cls._project(dp)
+                cls._write_update_score(dp, projection)
+                cls._write_coop_update(dp, projection)
+                cls._write_coop_update_team(dp, projection)
+                cls._write_grant_trophies(dp, projection)
+                cls._write_update_points(dp, projection)
@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+from typing import Iterator
+
+
+class DirectoryScanner:
+    """
+    Walks directory trees with os.scandir and remembers the listing of each directory.
+    A directory is listed again only if its mtime has changed,
+    which happens when a file or a folder is added, deleted or renamed inside it.
+    Content changes of files don't change the directory's mtime, so files still have to be checked separately.
+    """
+
+    # Directory -> (st_mtime_ns, subdirectories, files), both lists are sorted by _sort_key
+    _listings: dict[Path, tuple[int, list[Path], list[Path]]] = {}
+
+    @staticmethod
+    def _sort_key(name: str) -> tuple[str, str]:
+        # The order of NTFS (Windows), which generated files in the repository were made with
+        return name.upper(), name
+
+    @classmethod
+    def listdir(cls, directory: Path) -> tuple[list[Path], list[Path]]:
+        """
+        Returns subdirectories and files of the directory.
+        :param directory: Path to the directory.
+        :return: Tuple of sorted lists (subdirectories, files). Both are empty if the directory doesn't exist.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            cls._listings.pop(directory, None)
+            return [], []
+
+        cached = cls._listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+
+        subdirectories, files = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirectories.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+
+        listing = (
+            mtime_ns,
+            [directory / name for name in sorted(subdirectories, key=cls._sort_key)],
+            [directory / name for name in sorted(files, key=cls._sort_key)],
+        )
+        cls._listings[directory] = listing
+        return listing[1], listing[2]
+
+    @classmethod
+    def walk_files(cls, root: Path, suffix: str = None) -> Iterator[Path]:
+        """
+        Yields files of the directory tree: files of a directory first, then files of its subdirectories.
+        :param root: Path to the root directory.
+        :param suffix: If set, only files with this suffix (ex. ".json") are yielded.
+        :return: Iterator of file paths.
+        """
+        subdirectories, files = cls.listdir(root)
+        for file in files:
+            if suffix is None or str(file).endswith(suffix):
+                yield file
+        for subdirectory in subdirectories:
+            yield from cls.walk_files(subdirectory, suffix)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._listings.clear()
@@ -0,0 +1,208 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from .Advancement import AdvancementsManager
+from .Datapack import Datapack, DatapackList
+from .DirectoryScanner import DirectoryScanner
+from .utils import get_flag_setting
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# struct inotify_event: int wd, uint32 mask, uint32 cookie, uint32 len, char name[len]
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """
+    Watches datapack folders with inotify (Linux only).
+    A background thread only collects changed paths,
+    they are applied to AdvancementsManager and function files by flush() in the caller's thread
+    (it's called by AdvancementsManager.generate), so advancements never change
+    while the main thread iterates them.
+    """
+
+    def __init__(self, paths: Iterable[Path], poll_interval: float = 0.3):
+        """
+        :param paths: Folders to watch recursively.
+        :param poll_interval: Seconds between checks whether the watcher has been stopped.
+        """
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._poll_interval = poll_interval
+        self._watches: dict[int, Path] = {}
+        self._pending: set[Path] = set()
+        self._overflow = False
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="FileWatcher", daemon=True
+        )
+
+        for path in paths:
+            self._add_tree(path)
+
+    @staticmethod
+    def is_supported() -> bool:
+        return (
+            sys.platform.startswith("linux")
+            and ctypes.util.find_library("c") is not None
+        )
+
+    @classmethod
+    def start(cls, datapacks: Iterable[Datapack] = None) -> "FileWatcher | None":
+        """
+        Starts watching datapacks and attaches the watcher to AdvancementsManager.
+        :param datapacks: Datapacks to watch. All available datapacks by default.
+        :return: Started watcher, or None if inotify isn't supported.
+        """
+        if not cls.is_supported():
+            return None
+        if datapacks is None:
+            datapacks = DatapackList.available
+        watcher = cls(datapack.path for datapack in datapacks)
+        watcher._thread.start()
+        AdvancementsManager.set_watcher(watcher)
+        return watcher
+
+    @classmethod
+    def start_if_enabled(cls) -> "FileWatcher | None":
+        """
+        Starts the watcher if the `watch_files` setting is enabled.
+        :return: Started watcher or None.
+        """
+        if not get_flag_setting("watch_files"):
+            return None
+        return cls.start()
+
+    def stop(self) -> None:
+        """
+        Stops watching and detaches the watcher from AdvancementsManager.
+        :return: None
+        """
+        AdvancementsManager.set_watcher(None)
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        os.close(self._fd)
+
+    def flush(self) -> bool:
+        """
+        Applies all collected changes in the current thread.
+        :return: False if some events could be lost or changes can't be applied,
+        so a full rescan is needed.
+        """
+        if not self._thread.is_alive():
+            return False
+        with self._lock:
+            self._read_events()
+            paths, self._pending = self._pending, set()
+            if self._overflow:
+                self._overflow = False
+                return False
+
+        if paths:
+            try:
+                AdvancementsManager.update_paths(sorted(paths))
+            except Exception:
+                # Don't stop watching because of one broken file, rescan everything instead
+                return False
+        return True
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Can't watch {directory}: {os.strerror(errno)}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, root: Path) -> None:
+        for directory, _, _ in os.walk(root):
+            self._add_watch(Path(directory))
+
+    def _remove_tree(self, root: Path) -> None:
+        for wd, directory in list(self._watches.items()):
+            if directory.is_relative_to(root):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([self._fd], [], [], self._poll_interval)
+            # Events are read to keep the inotify queue from overflowing
+            if readable:
+                with self._lock:
+                    self._read_events()
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                self._handle_event(wd, mask, name)
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self._overflow = True
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+
+        directory = self._watches.get(wd)
+        # Events of the watched folder itself are reported by its parent too
+        if directory is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            return
+
+        path = directory / name
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+                # Files could be created before the folder was watched
+                self._pending.update(DirectoryScanner.walk_files(path))
+            elif mask & IN_MOVED_FROM:
+                self._remove_tree(path)
+
+        self._pending.add(path)
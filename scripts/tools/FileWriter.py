@@ -0,0 +1,217 @@
+import itertools
+import locale
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class FileTransaction:
+    """
+    Buffered writes, which are applied all together or not at all.
+    Content is written to temporary files next to the targets by a thread pool right away,
+    on commit the temporary files replace the targets.
+    """
+
+    _temp_ids = itertools.count()
+
+    def __init__(self):
+        self._pending: dict[Path, bytes] = {}
+        # Target -> the latest temporary file
+        self._temp_paths: dict[Path, Path] = {}
+        # Temporary files of overwritten content
+        self._stale_temp_paths: list[Path] = []
+        self._futures: list[Future] = []
+        self._executor = ThreadPoolExecutor(thread_name_prefix="FileTransaction")
+
+    @staticmethod
+    def _write_temp(temp_path: Path, data: bytes) -> None:
+        temp_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_bytes(data)
+
+    def write(self, path: Path, data: bytes) -> None:
+        temp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{next(self._temp_ids)}.tmp"
+        )
+        if path in self._temp_paths:
+            self._stale_temp_paths.append(self._temp_paths[path])
+        self._pending[path] = data
+        self._temp_paths[path] = temp_path
+        self._futures.append(self._executor.submit(self._write_temp, temp_path, data))
+
+    def get(self, path: Path) -> bytes | None:
+        """
+        Returns content, which will be written to the path on commit.
+        """
+        return self._pending.get(path)
+
+    def _remove_temp_files(self, temp_paths: Iterator[Path]) -> None:
+        for temp_path in temp_paths:
+            temp_path.unlink(missing_ok=True)
+
+    def commit(self) -> None:
+        """
+        Replaces target files with written temporary files.
+        If some temporary file can't be written, nothing is replaced.
+        :return: None
+        """
+        try:
+            for future in self._futures:
+                future.result()
+        except BaseException:
+            self.discard()
+            raise
+
+        for path, temp_path in self._temp_paths.items():
+            os.replace(temp_path, path)
+        self._remove_temp_files(self._stale_temp_paths)
+        self._close()
+
+    def discard(self) -> None:
+        """
+        Drops all buffered writes, target files stay untouched.
+        :return: None
+        """
+        wait(self._futures)
+        self._remove_temp_files(
+            itertools.chain(self._temp_paths.values(), self._stale_temp_paths)
+        )
+        self._close()
+
+    def _close(self) -> None:
+        self._executor.shutdown()
+        self._pending.clear()
+        self._temp_paths.clear()
+        self._stale_temp_paths.clear()
+        self._futures.clear()
+
+
+class FileWriter:
+    """
+    Writes generated files only if their content has changed,
+    so unchanged files keep their mtime and don't show up in git status or syncs.
+    Counts written and unchanged files, see reset_counters().
+    Inside transaction() writes are buffered and applied together on exit.
+    Transactions are per thread, so concurrent tasks can commit their files independently.
+    """
+
+    written = 0
+    unchanged = 0
+    _counters_lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def _get_transaction(cls) -> FileTransaction | None:
+        return getattr(cls._local, "transaction", None)
+
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Iterator[FileTransaction]:
+        """
+        Buffers all writes made inside the context and commits them on exit.
+        If an exception is raised, no file is changed. Nested transactions are joined to the outer one.
+        """
+        if (transaction := cls._get_transaction()) is not None:
+            yield transaction
+            return
+
+        transaction = cls._local.transaction = FileTransaction()
+        try:
+            yield transaction
+        except BaseException:
+            cls._local.transaction = None
+            transaction.discard()
+            raise
+        cls._local.transaction = None
+        transaction.commit()
+
+    @classmethod
+    def get_pending(cls, path: Path) -> bytes | None:
+        """
+        Returns content, which has been written to the path in the current transaction.
+        """
+        transaction = cls._get_transaction()
+        if transaction is None:
+            return None
+        return transaction.get(path)
+
+    @classmethod
+    def read_pending_text(cls, path: Path, encoding: str = None) -> str | None:
+        """
+        Returns pending content of the path decoded as Path.read_text does.
+        :return: Content or None if the path has no pending content.
+        """
+        data = cls.get_pending(path)
+        if data is None:
+            return None
+        text = data.decode(encoding or locale.getpreferredencoding(False))
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    @staticmethod
+    def _encode(content: str, encoding: str | None) -> bytes:
+        """
+        Encodes the content the same way as Path.write_text does.
+        """
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        return content.encode(encoding or locale.getpreferredencoding(False))
+
+    @classmethod
+    def write_bytes(cls, path: Path, data: bytes) -> bool:
+        """
+        Writes the file if its current content differs.
+        :param path: Path to the file.
+        :param data: New content.
+        :return: True if the file has been written.
+        """
+        pending = cls.get_pending(path)
+        if pending is not None:
+            if pending == data:
+                cls._count(written=False)
+                return False
+        else:
+            try:
+                if path.stat().st_size == len(data) and path.read_bytes() == data:
+                    cls._count(written=False)
+                    return False
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+
+        if (transaction := cls._get_transaction()) is not None:
+            transaction.write(path, data)
+        else:
+            path.write_bytes(data)
+        cls._count(written=True)
+        return True
+
+    @classmethod
+    def write_text(cls, path: Path, content: str, encoding: str = None) -> bool:
+        """
+        Writes the file as Path.write_text does, if its current content differs.
+        :param path: Path to the file.
+        :param content: New content.
+        :param encoding: Encoding of the file. Locale's encoding by default.
+        :return: True if the file has been written.
+        """
+        return cls.write_bytes(path, cls._encode(content, encoding))
+
+    @classmethod
+    def _count(cls, written: bool) -> None:
+        with cls._counters_lock:
+            if written:
+                cls.written += 1
+            else:
+                cls.unchanged += 1
+
+    @classmethod
+    def reset_counters(cls) -> tuple[int, int]:
+        """
+        Resets counters of files.
+        :return: Numbers of written and unchanged files before the reset.
+        """
+        with cls._counters_lock:
+            counters = cls.written, cls.unchanged
+            cls.written = cls.unchanged = 0
+        return counters
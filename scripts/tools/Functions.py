@@ -1,5 +1,9 @@
+from contextlib import contextmanager
+
 from . import Advancement, DatapackList
 from .Color import Color
+from .DirectoryScanner import DirectoryScanner
+from .FileWriter import FileWriter
 from .Item import TrophyItem, RewardItem
 from .Patterns import FunctionsWritePatterns, FunctionsReadPatterns
 from .Resources import ItemProperties
@@ -8,11 +12,85 @@ from .nbt_parser import nbt_decoder, nbt_encoder
 from .utils import *
 
 
+class FunctionFileCache:
+    """
+    Shared cache of function files' content.
+    An entry is valid while the file's mtime and size are the same,
+    so each file is read only once after it has been changed.
+    """
+
+    # Path -> (st_mtime_ns, st_size, content)
+    _entries: dict[Path, tuple[int, int, str]] = {}
+
+    @classmethod
+    def read(cls, path: Path, encoding: str) -> str | None:
+        """
+        Returns the content of the file, as Path.read_text does.
+        :param path: Path to the file.
+        :param encoding: Encoding of the file.
+        :return: Content or None if the file doesn't exist.
+        """
+        pending = FileWriter.read_pending_text(path, encoding)
+        if pending is not None:
+            return pending
+
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            cls._entries.pop(path, None)
+            return None
+
+        entry = cls._entries.get(path)
+        if (
+            entry is not None
+            and entry[0] == stat.st_mtime_ns
+            and entry[1] == stat.st_size
+        ):
+            return entry[2]
+
+        content = path.read_text(encoding=encoding)
+        cls._entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
+    @classmethod
+    def write(cls, path: Path, content: str, encoding: str) -> None:
+        """
+        Writes the file and caches the written content.
+        :param path: Path to the file.
+        :param content: New content.
+        :param encoding: Encoding of the file.
+        :return: None
+        """
+        FileWriter.write_text(path, content, encoding)
+        if FileWriter.get_pending(path) is not None:
+            # Written on commit of the transaction, read() returns the pending content till then
+            cls._entries.pop(path, None)
+            return
+        stat = os.stat(path)
+        # Path.read_text translates newlines, so the content is cached as it would be read
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+        cls._entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+
+
 class FuncMixin:
     """
     Mixin for rewards
     """
 
+    __slots__ = (
+        "_adv",
+        "_path",
+        "_mc_path",
+        "_exist",
+        "_empty_generated",
+        "_empty",
+        "_parsed_content",
+    )
+
     _mc_path_not_empty = set()
 
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
@@ -22,6 +100,8 @@ class FuncMixin:
         self._exist = None
         self._empty_generated = None
         self._empty = None
+        # Content, which data of the function has been parsed from, see _update_parsed()
+        self._parsed_content = None
 
     @property
     def path(self):
@@ -52,9 +132,9 @@ class FuncMixin:
         return self._empty_generated
 
     def create_file_state(self):
-        if self._path.exists():
+        content = FunctionFileCache.read(self._path, self._adv.datapack.encoding)
+        if content is not None:
             self._exist = True
-            content = self._path.read_text(encoding=self._adv.datapack.encoding)
             self._empty_generated = content == self._adv.datapack.empty_file
             self._empty = content == ""
         else:
@@ -66,23 +146,40 @@ class FuncMixin:
 
     @property
     def content(self) -> str:
-        if self._path.exists():
-            content = self._path.read_text(encoding=self._adv.datapack.encoding)
-            return content
-        else:
-            return ""
+        content = FunctionFileCache.read(self._path, self._adv.datapack.encoding)
+        return "" if content is None else content
 
     @content.setter
     def content(self, new_content: str) -> None:
         if self._path.exists():
-            self._path.write_text(new_content, encoding=self._adv.datapack.encoding)
+            FunctionFileCache.write(
+                self._path, new_content, self._adv.datapack.encoding
+            )
         else:
             raise FileNotFoundError("Can't write to file", self._path)
 
     def _write_file(self, content):
         if not self._path.parent.exists():
             self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(content, encoding=self._adv.datapack.encoding)
+        FunctionFileCache.write(self._path, content, self._adv.datapack.encoding)
+        self._parsed_content = None
+
+    def _parse_content(self, content: str) -> None:
+        """
+        Parses data of the function (item, exp, etc.) from its content.
+        Overridden by functions, which have such data.
+        """
+
+    def _update_parsed(self) -> None:
+        """
+        Parses the content on the first access to the data
+        and again only after the content has been changed.
+        The content is cached per mtime, so checking an unchanged file doesn't read it.
+        """
+        content = self.content
+        if content != self._parsed_content:
+            self._parse_content(content)
+            self._parsed_content = content
 
 
 class Main(FuncMixin):
@@ -90,6 +187,8 @@ class Main(FuncMixin):
     Class for main's file to run functions.
     """
 
+    __slots__ = ()
+
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
         super().__init__(advancement, path, mc_path)
 
@@ -120,13 +219,14 @@ class Exp(FuncMixin):
     Class for exp's reward.
     """
 
+    __slots__ = ("_exp",)
+
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
         super().__init__(advancement, path, mc_path)
         self._exp = None
-        self.__parse_from_file()
 
-    def __parse_from_file(self):
-        search = re.search(FunctionsReadPatterns.exp_command, self.content)
+    def _parse_content(self, content: str) -> None:
+        search = re.search(FunctionsReadPatterns.exp_command, content)
         if search:
             self._exp = int(search.groups()[0])
         else:
@@ -141,9 +241,8 @@ class Exp(FuncMixin):
         if not self._adv.datapack.generate_functions:
             return
         if exp:
-            self._exp = int(exp)
             self._write_file(
-                fill_pattern(FunctionsWritePatterns.exp, {"exp": str(self._exp)})
+                fill_pattern(FunctionsWritePatterns.exp, {"exp": str(int(exp))})
             )
         else:
             self._write_file(self._adv.datapack.empty_file)
@@ -153,6 +252,7 @@ class Exp(FuncMixin):
         """
         Returns amount of exp or None, if it doesn't set
         """
+        self._update_parsed()
         return self._exp
 
 
@@ -161,6 +261,8 @@ class Msg(FuncMixin):
     Class for msg's function.
     """
 
+    __slots__ = ()
+
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
         super().__init__(advancement, path, mc_path)
 
@@ -204,14 +306,16 @@ class Reward(FuncMixin):
     Class for reward's functions.
     """
 
+    __slots__ = ("_item", "_command_type")
+
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
         super().__init__(advancement, path, mc_path)
         self._item = None
         self._command_type = None
-        self.__parse_from_file()
 
-    def __parse_from_file(self):
-        content = self.content
+    def _parse_content(self, content: str) -> None:
+        self._item = None
+        self._command_type = None
 
         item_type_match = re.search(
             r"tellraw .*?{\"translate\":\"(item|block)", content
@@ -262,9 +366,6 @@ class Reward(FuncMixin):
         """
         if not item_id:
             self._write_file(self._adv.datapack.empty_file)
-            self._item = None
-            self._command_type = None
-            self.__parse_from_file()
             return None
 
         if components and "stored_enchantments" in components.keys():
@@ -307,7 +408,6 @@ class Reward(FuncMixin):
             else ""
         )
         self._write_file(give_command + tellraw)
-        self.__parse_from_file()
         return give_command + tellraw + summon_tellraw
 
     @property
@@ -315,6 +415,7 @@ class Reward(FuncMixin):
         """
         Return item's.
         """
+        self._update_parsed()
         return self._item
 
     @property
@@ -322,17 +423,19 @@ class Reward(FuncMixin):
         """
         Return command's name ("give" or "summon")
         """
+        self._update_parsed()
         return self._command_type
 
 
 class Trophy(FuncMixin):
+    __slots__ = ("_command_type", "_item")
+
     item_id_counter = Counter()
 
     def __init__(self, advancement: Advancement, path: Path, mc_path: str):
         super().__init__(advancement, path, mc_path)
         self._command_type = None
         self._item = None
-        self.__parse_from_file()
 
     @staticmethod
     def __parse_description(lore: List) -> List:
@@ -352,17 +455,20 @@ class Trophy(FuncMixin):
                 )
         return desc_list
 
-    def __parse_from_file(self) -> None:
+    def _parse_content(self, content: str) -> None:
+        self._command_type = None
+        self._item = None
+
         give_pattern = FunctionsReadPatterns.give_command_trophy
         summon_pattern = FunctionsReadPatterns.summon_command_trophy
 
-        give_search = re.search(give_pattern, self.content)
+        give_search = re.search(give_pattern, content)
         if give_search:
             self._command_type = "give"
             item_id = give_search["item_id"]
             components = item_components_decoder(give_search.groupdict()["components"])
         else:
-            summon_search = re.search(summon_pattern, self.content)
+            summon_search = re.search(summon_pattern, content)
             if not summon_search:
                 return  # Ни одна команда не найдена, выходим
 
@@ -410,9 +516,6 @@ class Trophy(FuncMixin):
 
         if item_id is None:
             self._write_file(self._adv.datapack.empty_file)
-            self._command_type = None
-            self._item = None
-            self.__parse_from_file()
             return None
 
         elif not (name and description and color):
@@ -483,7 +586,6 @@ class Trophy(FuncMixin):
             raise ValueError("Command may be only 'summon' or 'give'")
 
         self._write_file(text_command)
-        self.__parse_from_file()
         return text_command
 
     def gen_from_selfdata(self):
@@ -502,7 +604,7 @@ class Trophy(FuncMixin):
             self._write_file(self._adv.datapack.empty_file)
             return self._adv.datapack.empty_file
 
-        self._item.regenerate_award_lore(
+        self.item.regenerate_award_lore(
             self._adv.title,
             self._adv.datapack.get_trophy_text_color_by_type(
                 self._adv.type, self._adv.hidden
@@ -515,7 +617,7 @@ class Trophy(FuncMixin):
             "extra": [{"translate": self.item.name}],
         }
 
-        components = self._item.components
+        components = self.item.components
         components.update(
             {
                 "custom_model_data": {
@@ -557,7 +659,6 @@ class Trophy(FuncMixin):
             raise ValueError("Command may be only 'summon' or 'give'")
 
         self._write_file(file_content)
-        self.__parse_from_file()
         return file_content
 
     @property
@@ -565,6 +666,7 @@ class Trophy(FuncMixin):
         """
         Return trophy's item's class.
         """
+        self._update_parsed()
         return self._item
 
     @property
@@ -572,6 +674,7 @@ class Trophy(FuncMixin):
         """
         Return trophy's command's name ("give" or "summon").
         """
+        self._update_parsed()
         return self._command_type
 
 
@@ -580,8 +683,62 @@ class Functions:
     Class to work with advancement's rewards
     """
 
+    __slots__ = (
+        "_adv",
+        "_main",
+        "_exp",
+        "_msg",
+        "_reward",
+        "_trophy",
+        "main_path",
+        "exp_path",
+        "msg_path",
+        "reward_path",
+        "trophy_path",
+        "mc_main_path",
+        "mc_exp_path",
+        "mc_msg_path",
+        "mc_reward_path",
+        "mc_trophy_path",
+    )
+
     exist_mc_path = set()
 
+    # Function folders, which existence checks use a single scan for, see prescanned()
+    _prescanned_roots: set[Path] = set()
+    _prescanned_files: set[Path] | None = None
+
+    @classmethod
+    @contextmanager
+    def prescanned(cls, datapacks: Iterable["Datapack"]):
+        """
+        Inside the context existence of function files of the datapacks is checked
+        in a set of files, which is built by one walk of their function folders.
+        Files created inside the context aren't seen, so it's used only while loading.
+        :param datapacks: Datapacks to scan.
+        """
+        cls._prescanned_roots = {
+            datapack.reward_path for datapack in datapacks if datapack.reward_path
+        }
+        cls._prescanned_files = None
+        try:
+            yield
+        finally:
+            cls._prescanned_roots = set()
+            cls._prescanned_files = None
+
+    @classmethod
+    def _file_exists(cls, path: Path, reward_path: Path) -> bool:
+        if reward_path not in cls._prescanned_roots:
+            return path.exists()
+        if cls._prescanned_files is None:
+            cls._prescanned_files = {
+                file
+                for root in cls._prescanned_roots
+                for file in DirectoryScanner.walk_files(root, ".mcfunction")
+            }
+        return path in cls._prescanned_files
+
     def __init__(self, adv: "Advancement"):
         self._adv = adv
         self._main = None
@@ -620,7 +777,7 @@ class Functions:
             (self.trophy_path, self.mc_trophy_path),
         ]
         for path, mc_path in paths:
-            if path.exists():
+            if self._file_exists(path, self._adv.datapack.reward_path):
                 self.exist_mc_path.add(mc_path)
 
     def _reset_cache(self):
@@ -630,6 +787,29 @@ class Functions:
         self._reward = None
         self._trophy = None
 
+    def reload(self) -> None:
+        """
+        Drops parsed function files, they will be parsed again on the next access.
+        Used when files have been changed outside the script.
+        :return: None
+        """
+        self._reset_cache()
+
+    @classmethod
+    def update_file_state(cls, path: Path) -> None:
+        """
+        Updates cached existence and emptiness of a function file,
+        which has been created, changed or deleted outside the script.
+        :param path: Path to the function file.
+        :return: None
+        """
+        mc_path = path_to_mc_path(path)
+        FuncMixin._mc_path_not_empty.discard(mc_path)
+        if path.exists():
+            cls.exist_mc_path.add(mc_path)
+        else:
+            cls.exist_mc_path.discard(mc_path)
+
     def update_paths(self) -> None:
         """
         Update functions file's by updating advancement's params.
@@ -143,6 +143,8 @@ class Potion:
 
 
 class Item:
+    __slots__ = ("_id", "_components", "_head_data")
+
     def __init__(
         self,
         /,
@@ -209,6 +211,8 @@ class Item:
 
 
 class RewardItem(Item):
+    __slots__ = ("_type", "_amount")
+
     def __init__(
         self,
         item_id: str,
@@ -245,6 +249,8 @@ class RewardItem(Item):
 
 
 class TrophyItem(Item):
+    __slots__ = ("_name", "_color", "_lore")
+
     def __init__(
         self,
         item_id: str,
@@ -2,6 +2,7 @@ import json
 from collections.abc import Iterable
 
 from . import Datapack, AdvancementsManager
+from .FileWriter import FileWriter
 from .utils import get_adv_json
 
 
@@ -41,7 +42,8 @@ class MilestonesGenerator:
                     ][adv.mc_path] = True
                     adv_json["criteria"][adv.filename] = criteria
 
-                milestone_path.write_text(
+                FileWriter.write_text(
+                    milestone_path,
                     json.dumps(adv_json, indent=2), encoding=dp.encoding
                 )
                 AdvancementsManager.update_advancement(milestone_path, dp)
@@ -80,7 +82,8 @@ class MilestonesGenerator:
                 ][adv.mc_path] = True
                 adv_json["criteria"][adv.filename] = criteria
 
-            dp.legend_adv_path.write_text(
+            FileWriter.write_text(
+                dp.legend_adv_path,
                 json.dumps(adv_json, indent=2), encoding=dp.encoding
             )
 
@@ -88,5 +91,10 @@ class MilestonesGenerator:
 
     @classmethod
     def generate_all(cls, datapack: Datapack | Iterable[Datapack]) -> None:
-        cls.generate_milestones(datapack)
-        cls.generate_advancement_legend(datapack)
+        """
+        Generates milestones and the legend advancement.
+        Files are changed only if all of them have been generated.
+        """
+        with FileWriter.transaction():
+            cls.generate_milestones(datapack)
+            cls.generate_advancement_legend(datapack)
@@ -1,18 +1,27 @@
 import os
 from collections.abc import Iterable
-from shutil import make_archive
-from typing import List, Tuple
+from pathlib import Path
+from typing import Callable, List, Tuple
 
-from .Advancement import AdvancementsManager
-from .Datapack import Datapack
+from .Advancement import AdvancementsManager, BaseAdvancement
+from .BaseTranslationGenerator import BaseTranslationGenerator
+from .ChecklistGenerators import BabyZooGenerator, MobUniverseGenerator
+from .Datapack import Datapack, DatapackList
+from .DatapackFunctionsGenerator import DatapackFunctionsGenerator
+from .FileWriter import FileWriter
 from .InterfaceSchema import *
-from .MissingTranslationFinder import MissingTranslationFinder
-from .Validator import Validator
+from .MilestonesGenerator import MilestonesGenerator
+from .ReleaseArchive import ArchiveDelta, ReleaseArchive
+from .ReleasePipeline import Stage
+from .ValidationEngine import ValidationEngine
 from .Warnings import AdvWarning, AdvWarningType
-from .utils import fill_pattern
+from .utils import fill_pattern, get_workers_setting
 
 
 class Release:
+    # Pipeline resource of stages using advancements, validation or function caches
+    advancements_resource = "advancements"
+
     @staticmethod
     def create_install(datapack: Datapack, version: str):
         """
@@ -25,36 +34,53 @@ class Release:
         install_text = fill_pattern(
             datapack.install_mcfunc_pattern, {"version": version, "filename": filename}
         )
-        datapack.install_path.write_text(install_text, encoding=datapack.encoding)
+        FileWriter.write_text(
+            datapack.install_path, install_text, encoding=datapack.encoding
+        )
 
     @staticmethod
-    def create_datapack_zip(datapack: Datapack, version: str):
+    def _create_zip(root: Path, name: str, manifest_name: str) -> ArchiveDelta:
         """
-        Create zipped datapack
+        Creates releases/{name}.zip, copying unchanged files from the previous release zip.
+        Changed files are listed in releases/manifests/{name}.delta.txt.
         """
-        output_path = os.path.join(
-            os.getcwd(),
-            "releases",
-            fill_pattern(datapack.release_name_pattern, values={"version": version}),
+        releases_path = Path(os.getcwd(), "releases")
+        manifests_path = releases_path / "manifests"
+        delta = ReleaseArchive.create(
+            root,
+            releases_path / f"{name}.zip",
+            manifest_path=manifests_path / f"{manifest_name}.json",
+        )
+        (manifests_path / f"{name}.delta.txt").write_text(
+            delta.report(), encoding="utf-8"
         )
+        return delta
 
-        make_archive(
-            base_name=output_path, format="zip", root_dir=datapack.path, base_dir="."
+    @classmethod
+    def create_datapack_zip(cls, datapack: Datapack, version: str) -> ArchiveDelta:
+        """
+        Create zipped datapack
+        :return: Changes of files since the previous release of the datapack.
+        """
+        return cls._create_zip(
+            datapack.path,
+            fill_pattern(datapack.release_name_pattern, values={"version": version}),
+            datapack.name,
         )
 
-    @staticmethod
-    def create_language_pack_zip(datapack: Datapack):
+    @classmethod
+    def create_language_pack_zip(cls, datapack: Datapack) -> ArchiveDelta | None:
         """
         Create zipped language pack
+        :return: Changes of files since the previous release of the language pack.
         """
+        if not datapack.language_pack:
+            return None
 
-        output_path = os.path.join(os.getcwd(), "releases", datapack.language_pack)
-
-        make_archive(
-            base_name=output_path,
-            format="zip",
-            root_dir=datapack.language_pack,
-            base_dir=".",
+        return cls._create_zip(
+            Path(datapack.language_pack),
+            datapack.language_pack,
+            datapack.language_pack,
         )
 
     @staticmethod
@@ -62,6 +88,27 @@ class Release:
         print_warning(adv, indent=indent)
         output(warning.reason, indent=indent + 3)
 
+    @staticmethod
+    def collect_warnings(
+        datapack: Datapack | List[Datapack],
+    ) -> tuple[list[tuple[BaseAdvancement, list[AdvWarning]]], dict[str, float]]:
+        """
+        Check all advancements of the datapack without printing anything.
+        :return: Advancements with their warnings (only advancements, which have warnings)
+        and validation time of each validator.
+        """
+        advancements = list(
+            AdvancementsManager.filtered_iterator(datapack=datapack, skip_invalid=False)
+        )
+        advancements_warnings, timings = ValidationEngine.validate_all(
+            advancements, get_workers_setting("check_workers")
+        )
+        return [
+            (adv, warnings)
+            for adv, warnings in zip(advancements, advancements_warnings)
+            if warnings
+        ], timings
+
     @classmethod
     def check(cls, datapack: Datapack | List[Datapack]):
         """
@@ -69,19 +116,11 @@ class Release:
         :return: Number of warnings
         """
         warnings_type_dict: dict[str, list[Tuple[Advancement, AdvWarning]]] = {}
-        warnings_count = 0
-
-        for adv in AdvancementsManager.filtered_iterator(
-            datapack=datapack, skip_invalid=False
-        ):
-            warnings = Validator.validate_advancement(adv)
-            if not isinstance(adv, InvalidAdvancement):
-                warnings.extend(MissingTranslationFinder.find_missing_translations(adv))
 
-            if not warnings:
-                continue
-            warnings_count += 1
+        advancements_warnings, timings = cls.collect_warnings(datapack)
+        warnings_count = len(advancements_warnings)
 
+        for adv, warnings in advancements_warnings:
             for warning in warnings:
                 if warning.warning_type.name not in warnings_type_dict:
                     warnings_type_dict[warning.warning_type.name] = []
@@ -121,6 +160,10 @@ class Release:
                     cls.show_adv_warning(adv, warning)
 
         output("All advancements checked")
+        output(
+            "Validation time: "
+            + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+        )
 
         if not warnings_count:
             output("No warnings found")
@@ -130,16 +173,126 @@ class Release:
     @staticmethod
     def format_datapack_json(datapack: Datapack | Iterable[Datapack]):
         """
-        Format all advancements of the datapack
+        Format all advancements of the datapack.
+        Files are changed only if all advancements have been formatted.
         """
+        with FileWriter.transaction():
+            for adv in AdvancementsManager.filtered_iterator(datapack=datapack):
+                adv.format_json()
+                adv.functions.main.generate()
+                adv.functions.msg.generate()
 
-        for adv in AdvancementsManager.filtered_iterator(datapack=datapack):
-            adv.format_json()
-            adv.functions.main.generate()
-            adv.functions.msg.generate()
+            for adv in AdvancementsManager.filtered_iterator(
+                datapack=datapack, skip_invalid=False, skip_normal=True
+            ):
+                if adv.reason.warning_type == AdvWarningType.REWARD_FUNCTION_DOESNT_SET:
+                    adv.create_reward_function()
 
-        for adv in AdvancementsManager.filtered_iterator(
-            datapack=datapack, skip_invalid=False, skip_normal=True
-        ):
-            if adv.reason.warning_type == AdvWarningType.REWARD_FUNCTION_DOESNT_SET:
-                adv.create_reward_function()
+    @staticmethod
+    def pipeline_inputs(datapacks: Iterable[Datapack]) -> list[Path]:
+        """
+        Files and folders, which stages of a release pipeline read.
+        """
+        inputs = [Path("config"), Path("pages/assets/requirements.json")]
+        for dp in (DatapackList.default, *datapacks):
+            inputs.append(dp.path)
+            if dp.language_pack:
+                inputs.append(Path(dp.language_pack))
+        return [path for path in inputs if path.exists()]
+
+    @classmethod
+    def generation_stages(cls, datapack: Datapack | Iterable[Datapack]) -> list[Stage]:
+        """
+        Stages of a release pipeline, which generate files of the default datapack
+        and format advancements of the datapack. The last stage is named "format".
+        All of them read or write advancements, so they share the advancements resource.
+        """
+        default = DatapackList.default
+        advancements = (cls.advancements_resource,)
+        return [
+            Stage(
+                "base translation",
+                lambda: BaseTranslationGenerator.update(default),
+                message="Base Translation updated",
+                resources=advancements,
+            ),
+            Stage(
+                "milestones",
+                lambda: MilestonesGenerator.generate_all(default),
+                message="Milestones created",
+                resources=advancements,
+            ),
+            Stage(
+                "datapack functions",
+                lambda: DatapackFunctionsGenerator.generate_all(default),
+                ("milestones",),
+                "Datapack Functions created",
+                resources=advancements,
+            ),
+            Stage(
+                "mob universe",
+                lambda: MobUniverseGenerator(
+                    default.default_adv_namespace_path
+                ).generate_all_files(),
+                message="Mob Universe created",
+                resources=advancements,
+            ),
+            Stage(
+                "baby zoo",
+                lambda: BabyZooGenerator(
+                    default.default_adv_namespace_path
+                ).generate_all_files(),
+                message="Baby Zoo created",
+                resources=advancements,
+            ),
+            Stage(
+                "format",
+                lambda: cls.format_datapack_json(datapack),
+                ("base translation", "datapack functions", "mob universe", "baby zoo"),
+                "All Advancements formatted",
+                resources=advancements,
+            ),
+        ]
+
+    @classmethod
+    def zip_stages(
+        cls, datapacks: Iterable[Datapack], version: Callable[[Datapack], str]
+    ) -> list[Stage]:
+        """
+        Stages of a release pipeline, which create install functions and zips of the datapacks.
+        Stages of each datapack require the stage "check {datapack name}",
+        which should be added by the caller.
+        :param version: Returns the release version of the datapack, when it's required.
+        """
+        stages = []
+        # Datapacks can share a language pack, it's zipped once
+        language_packs: dict[str, list[Datapack]] = {}
+        for dp in datapacks:
+            check = f"check {dp.name}"
+            stages += [
+                Stage(
+                    f"install {dp.name}",
+                    lambda dp=dp: cls.create_install(dp, version(dp)),
+                    (check,),
+                    f"{dp.name}: Install created",
+                ),
+                Stage(
+                    f"zip {dp.name}",
+                    lambda dp=dp: cls.create_datapack_zip(dp, version(dp)).summary(),
+                    (f"install {dp.name}",),
+                    f"{dp.name}: Zip created",
+                ),
+            ]
+            if dp.language_pack:
+                language_packs.setdefault(dp.language_pack, []).append(dp)
+
+        for language_pack, dps in language_packs.items():
+            stages.append(
+                Stage(
+                    f"language pack {language_pack}",
+                    lambda dp=dps[0]: cls.create_language_pack_zip(dp).summary(),
+                    tuple(f"check {dp.name}" for dp in dps),
+                    f"{language_pack}: Zip created",
+                )
+            )
+        return stages
@@ -0,0 +1,399 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+from zipfile import ZIP_DEFLATED, ZIP_STORED
+
+from .utils import get_setting, get_workers_setting
+
+
+@dataclass(frozen=True)
+class ArchiveDelta:
+    """
+    Difference between an archive and the previous archive of the same manifest.
+    """
+
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+    unchanged: int
+    reused: int
+
+    def summary(self) -> str:
+        return (
+            f"added {len(self.added)}, changed {len(self.changed)}, "
+            f"removed {len(self.removed)}, unchanged {self.unchanged} "
+            f"({self.reused} copied without compression)"
+        )
+
+    def report(self) -> str:
+        """
+        :return: Text with the summary and all changed files, one per line.
+        """
+        lines = [self.summary()]
+        changes = (("+", self.added), ("*", self.changed), ("-", self.removed))
+        for sign, names in changes:
+            lines.extend(f"{sign} {name}" for name in names)
+        return "\n".join(lines) + "\n"
+
+
+class ReleaseArchive:
+    """
+    Writes reproducible zip archives of release folders.
+    Files are deflated in parallel by a thread pool (zlib releases the GIL) and written in one zip.
+    Entries are sorted and have a fixed timestamp and permissions,
+    so archives of the same content are equal byte by byte.
+
+    An archive can have a manifest with the hash, CRC-32, sizes and offset of every file.
+    Unchanged files are copied raw from the previous archive of the manifest
+    instead of being deflated again.
+    """
+
+    # 1980-01-01 00:00:00, the earliest date of the zip format
+    _dos_date = (1 << 5) | 1
+    _dos_time = 0
+    # Unix permissions in the high word of external attributes, 0x10 is the MS-DOS directory flag
+    _file_attributes = 0o100644 << 16
+    _directory_attributes = (0o040755 << 16) | 0x10
+    # Made by Unix (3), zip specification 2.0
+    _version_made_by = (3 << 8) | 20
+    _version_needed = 20
+    _utf8_flag = 0x800
+    _zip_max_entries = 0xFFFF
+    _zip_max_size = 0xFFFFFFFF
+    _local_header_format = "<IHHHHHIIIHH"
+    _manifest_version = 1
+
+    @staticmethod
+    def _iter_entries(root: Path) -> Iterator[tuple[str, Path | None]]:
+        """
+        Yields all folders and files of the root, as shutil.make_archive does.
+        :return: Iterator of (name in the archive, path of a file or None for a folder).
+        """
+        for dirpath, dirnames, filenames in os.walk(root):
+            relative = Path(dirpath).relative_to(root).as_posix()
+            prefix = "" if relative == "." else f"{relative}/"
+            for dirname in dirnames:
+                yield f"{prefix}{dirname}/", None
+            for filename in filenames:
+                yield f"{prefix}{filename}", Path(dirpath) / filename
+
+    @staticmethod
+    def _deflate_data(data: bytes, level: int) -> tuple[int, int, bytes]:
+        """
+        :return: CRC-32, size and raw deflated content of the data.
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush()
+        return zlib.crc32(data), len(data), deflated
+
+    @classmethod
+    def _deflate(
+        cls, path: Path, level: int, previous_hash: str | None
+    ) -> tuple[str, tuple[int, int, bytes] | None]:
+        """
+        Runs inside the thread pool.
+        :param previous_hash: Hash of the file in the previous archive, if it has the file.
+        :return: SHA-256 of the file and its CRC-32, size and raw deflated content,
+        or None instead of them if the file hasn't changed since the previous archive.
+        """
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == previous_hash:
+            return digest, None
+        return digest, cls._deflate_data(data, level)
+
+    @classmethod
+    def _read_manifest(cls, manifest_path: Path | None) -> dict[str, Any]:
+        """
+        :return: Manifest of the previous archive or an empty manifest,
+        if there is no manifest or it can't be read.
+        """
+        empty = {"archive": None, "level": None, "entries": {}}
+        if manifest_path is None:
+            return empty
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return empty
+        if manifest.get("version") != cls._manifest_version:
+            return empty
+        return manifest
+
+    @classmethod
+    def _read_raw_entry(
+        cls, archive: BinaryIO, name: bytes, entry: dict[str, Any]
+    ) -> bytes | None:
+        """
+        Reads compressed content of the entry from the previous archive.
+        :return: Raw deflated content or None if the archive doesn't match the manifest.
+        """
+        header_size = struct.calcsize(cls._local_header_format)
+        archive.seek(entry["offset"])
+        header = archive.read(header_size)
+        if len(header) != header_size:
+            return None
+        header_fields = struct.unpack(cls._local_header_format, header)
+        signature, method = header_fields[0], header_fields[3]
+        crc, compressed, size, name_length, extra_length = header_fields[6:]
+        if (
+            signature != 0x04034B50
+            or method != ZIP_DEFLATED
+            or crc != entry["crc"]
+            or compressed != entry["compressed"]
+            or size != entry["size"]
+            or archive.read(name_length) != name
+        ):
+            return None
+        archive.seek(extra_length, os.SEEK_CUR)
+        data = archive.read(compressed)
+        return data if len(data) == compressed else None
+
+    @staticmethod
+    def _replace_file(path: Path, data: bytes) -> None:
+        temp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def _local_header(
+        cls, name: bytes, flags: int, method: int, crc: int, compressed: int, size: int
+    ) -> bytes:
+        return (
+            struct.pack(
+                cls._local_header_format,
+                0x04034B50,
+                cls._version_needed,
+                flags,
+                method,
+                cls._dos_time,
+                cls._dos_date,
+                crc,
+                compressed,
+                size,
+                len(name),
+                0,
+            )
+            + name
+        )
+
+    @classmethod
+    def _central_header(
+        cls,
+        name: bytes,
+        flags: int,
+        method: int,
+        crc: int,
+        compressed: int,
+        size: int,
+        attributes: int,
+        offset: int,
+    ) -> bytes:
+        return (
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                cls._version_made_by,
+                cls._version_needed,
+                flags,
+                method,
+                cls._dos_time,
+                cls._dos_date,
+                crc,
+                compressed,
+                size,
+                len(name),
+                0,
+                0,
+                0,
+                0,
+                attributes,
+                offset,
+            )
+            + name
+        )
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        output_path: Path,
+        level: int = None,
+        workers: int = None,
+        manifest_path: Path = None,
+    ) -> ArchiveDelta:
+        """
+        Creates a zip archive of all folders and files of the root.
+        The archive is written to a temporary file first and replaces output_path when it's complete.
+        If manifest_path is set, files, which haven't changed since the previous archive
+        of the manifest, are copied from it, and the manifest is updated.
+        :param root: Folder to archive.
+        :param output_path: Path of the archive.
+        :param level: Compression level from 0 to 9, `zip_compression_level` setting by default.
+        :param workers: Number of compressing threads, `zip_workers` setting by default.
+        :param manifest_path: Path of the manifest of the archive.
+        :return: Changes of files since the previous archive of the manifest.
+        """
+        if level is None:
+            level = int(get_setting("zip_compression_level", 6))
+        if workers is None:
+            workers = get_workers_setting("zip_workers", -1)
+
+        entries = sorted(cls._iter_entries(root))
+        if len(entries) > cls._zip_max_entries:
+            raise ValueError(f"Too many files for a zip archive: {len(entries)}")
+        files = [(name, path) for name, path in entries if path is not None]
+
+        previous = cls._read_manifest(manifest_path)
+        previous_entries: dict[str, dict[str, Any]] = previous["entries"]
+        previous_archive = None
+        if previous["archive"] and previous["level"] == level:
+            try:
+                previous_archive = (manifest_path.parent / previous["archive"]).open(
+                    "rb"
+                )
+            except OSError:
+                pass
+        # Without the previous archive, unchanged files must be deflated again
+        reusable_hashes = [
+            previous_entries.get(name, {}).get("hash") if previous_archive else None
+            for name, _ in files
+        ]
+
+        manifest_entries = {}
+        added, changed = [], []
+        reused = 0
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(
+            f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with (
+                ThreadPoolExecutor(max(workers, 1)) as executor,
+                temp_path.open("wb") as f,
+            ):
+                deflated = executor.map(
+                    cls._deflate,
+                    [path for _, path in files],
+                    [level] * len(files),
+                    reusable_hashes,
+                )
+                central_directory = []
+                for name, path in entries:
+                    encoded_name = name.encode("utf-8")
+                    flags = 0 if name.isascii() else cls._utf8_flag
+                    if path is None:
+                        method, crc, size, data = ZIP_STORED, 0, 0, b""
+                        attributes = cls._directory_attributes
+                    else:
+                        digest, content = next(deflated)
+                        data = None
+                        if content is None:
+                            entry = previous_entries[name]
+                            crc, size = entry["crc"], entry["size"]
+                            data = cls._read_raw_entry(
+                                previous_archive, encoded_name, entry
+                            )
+                        if data is None:
+                            crc, size, data = content or cls._deflate_data(
+                                path.read_bytes(), level
+                            )
+                        else:
+                            reused += 1
+                        method = ZIP_DEFLATED
+                        attributes = cls._file_attributes
+
+                        if name not in previous_entries:
+                            added.append(name)
+                        elif previous_entries[name]["hash"] != digest:
+                            changed.append(name)
+
+                    offset = f.tell()
+                    if max(offset, size, len(data)) > cls._zip_max_size:
+                        raise ValueError("Release is too big for a zip archive")
+                    f.write(
+                        cls._local_header(
+                            encoded_name, flags, method, crc, len(data), size
+                        )
+                    )
+                    f.write(data)
+                    central_directory.append(
+                        cls._central_header(
+                            encoded_name,
+                            flags,
+                            method,
+                            crc,
+                            len(data),
+                            size,
+                            attributes,
+                            offset,
+                        )
+                    )
+                    if path is not None:
+                        manifest_entries[name] = {
+                            "hash": digest,
+                            "crc": crc,
+                            "size": size,
+                            "compressed": len(data),
+                            "offset": offset,
+                        }
+
+                central_directory_offset = f.tell()
+                if central_directory_offset > cls._zip_max_size:
+                    raise ValueError("Release is too big for a zip archive")
+                f.writelines(central_directory)
+                f.write(
+                    struct.pack(
+                        "<IHHHHIIH",
+                        0x06054B50,
+                        0,
+                        0,
+                        len(entries),
+                        len(entries),
+                        f.tell() - central_directory_offset,
+                        central_directory_offset,
+                        0,
+                    )
+                )
+            if previous_archive is not None:
+                # The previous archive may have the same name,
+                # and open files can't be replaced on Windows
+                previous_archive.close()
+            os.replace(temp_path, output_path)
+        finally:
+            if previous_archive is not None:
+                previous_archive.close()
+            temp_path.unlink(missing_ok=True)
+
+        if manifest_path is not None:
+            manifest = {
+                "version": cls._manifest_version,
+                "archive": Path(
+                    os.path.relpath(output_path, manifest_path.parent)
+                ).as_posix(),
+                "level": level,
+                "entries": manifest_entries,
+            }
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            cls._replace_file(
+                manifest_path, json.dumps(manifest, indent=4).encode("utf-8")
+            )
+        return ArchiveDelta(
+            added=added,
+            changed=changed,
+            removed=sorted(previous_entries.keys() - manifest_entries.keys()),
+            unchanged=len(files) - len(added) - len(changed),
+            reused=reused,
+        )
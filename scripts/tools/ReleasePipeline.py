@@ -0,0 +1,224 @@
+import hashlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .Cache import PersistentCache
+from .FileWriter import FileWriter
+from .InterfaceSchema import output
+from .utils import get_workers_setting
+
+
+class PipelineCancelled(Exception):
+    """
+    Raised by a stage to stop the pipeline without an error, e.g. when the user declines to continue.
+    """
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Step of a pipeline.
+    :param name: Unique name of the stage.
+    :param func: Function without arguments, its result is available in ReleasePipeline.results.
+    :param requires: Names of stages, which must be completed before this stage.
+    :param message: Text printed when the stage is completed.
+    :param interactive: The stage asks the user, so it runs in the main thread
+    when no other stage is running.
+    :param resources: Names of shared in-memory state the stage uses,
+    stages with a common resource never run at the same time.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    requires: tuple[str, ...] = ()
+    message: str = ""
+    interactive: bool = False
+    resources: tuple[str, ...] = ()
+
+
+class ReleasePipeline:
+    """
+    Runs stages in the order of their dependencies.
+    Files written by a stage are committed when the stage is completed (see FileWriter.transaction).
+
+    Independent stages run concurrently in a thread pool. A stage function may run in parallel
+    with any stage, which is neither its dependency nor shares a resource with it.
+    Classes with class-level state (AdvancementsManager, Validator, FuncMixin caches,
+    PersistentCache instances) aren't thread-safe, so stages using them must declare
+    a common resource, e.g. "advancements". Stages, which only write their own files, need none.
+
+    Completed stages and their results are stored in the cache,
+    so a failed or cancelled run can be resumed from the stages, which haven't been completed.
+    The state also has a fingerprint of input files, if they have changed since the run,
+    it can't be resumed.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        inputs: Iterable[Path] = (),
+        cache_name: str = "release_pipeline",
+    ):
+        """
+        :param stages: Stages of the pipeline.
+        :param inputs: Files and folders, which stages read. Resuming is allowed only if
+        none of their files has been changed, added or removed since the last run.
+        :param cache_name: Name of the cache file with the state of the last run.
+        :raise ValueError: If stages have the same names, unknown or circular dependencies.
+        """
+        self._stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self._stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self._stages[stage.name] = stage
+        self._check_dependencies()
+
+        self._inputs = sorted(set(inputs))
+        self._state = PersistentCache(cache_name)
+        self.results: dict[str, Any] = {}
+        self.timings: dict[str, float] = {}
+
+    def _check_dependencies(self) -> None:
+        for stage in self._stages.values():
+            for name in stage.requires:
+                if name not in self._stages:
+                    raise ValueError(f"Unknown dependency of {stage.name}: {name}")
+
+        # Kahn's algorithm, the rest of stages are in a cycle
+        remaining = {name: set(stage.requires) for name, stage in self._stages.items()}
+        while ready := [name for name, requires in remaining.items() if not requires]:
+            for name in ready:
+                del remaining[name]
+            for requires in remaining.values():
+                requires.difference_update(ready)
+        if remaining:
+            raise ValueError(f"Circular dependencies: {', '.join(remaining)}")
+
+    def _fingerprint(self) -> str:
+        """
+        Returns a hash of paths, sizes and modification times of all input files.
+        """
+        digest = hashlib.sha1()
+        for root in self._inputs:
+            if root.is_file():
+                paths = [str(root)]
+            else:
+                paths = sorted(
+                    os.path.join(directory, name)
+                    for directory, _, names in os.walk(root)
+                    for name in names
+                )
+            for path in paths:
+                stat = os.stat(path)
+                digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+        return digest.hexdigest()
+
+    def _resumable_results(self) -> dict[str, Any]:
+        if self._state.get("stages") != list(self._stages):
+            return {}
+        if self._state.get("fingerprint") != self._fingerprint():
+            return {}
+        return self._state.get("completed", {})
+
+    def resumable(self) -> list[str]:
+        """
+        :return: Names of stages completed by the last run, if it hasn't been finished.
+        """
+        return list(self._resumable_results())
+
+    def _save_state(self, finished: bool) -> None:
+        if finished:
+            self._state.clear()
+        else:
+            self._state["stages"] = list(self._stages)
+            self._state["completed"] = dict(self.results)
+            self._state["fingerprint"] = self._fingerprint()
+        self._state.save()
+
+    def _run_stage(self, stage: Stage) -> tuple[Any, float]:
+        start = time.perf_counter()
+        with FileWriter.transaction():
+            result = stage.func()
+        return result, time.perf_counter() - start
+
+    def _complete(self, stage: Stage, result: Any, seconds: float) -> None:
+        self.results[stage.name] = result
+        self.timings[stage.name] = seconds
+        self._save_state(finished=False)
+        if stage.message:
+            output(f"{stage.message} ({seconds:.2f}s)")
+
+    def run(self, resume: bool = False, workers: int = None) -> dict[str, Any]:
+        """
+        Runs all stages, which haven't been completed.
+        If a stage raises an exception, running stages are finished and the exception is raised again.
+        :param resume: Skip stages completed by the last unfinished run.
+        :param workers: Number of threads for concurrent stages, `release_workers` setting by default.
+        :return: Results of all stages.
+        """
+        if workers is None:
+            workers = get_workers_setting("release_workers", -1)
+
+        self.results = self._resumable_results() if resume else {}
+        self.timings = {}
+        if self.results:
+            output(f"Resumed after: {', '.join(self.results)}")
+
+        pending = [name for name in self._stages if name not in self.results]
+        running: dict[Future, Stage] = {}
+        used_resources: set[str] = set()
+        error: BaseException | None = None
+        with ThreadPoolExecutor(
+            max(workers, 1), thread_name_prefix="Stage"
+        ) as executor:
+            while pending or running:
+                ready = [
+                    stage
+                    for stage in map(self._stages.get, pending)
+                    if all(name in self.results for name in stage.requires)
+                ]
+                if error is None:
+                    for stage in ready:
+                        if stage.interactive or used_resources.intersection(
+                            stage.resources
+                        ):
+                            continue
+                        pending.remove(stage.name)
+                        used_resources.update(stage.resources)
+                        running[executor.submit(self._run_stage, stage)] = stage
+
+                if not running:
+                    interactive = [stage for stage in ready if stage.interactive]
+                    if error is not None or not interactive:
+                        break
+                    stage = interactive[0]
+                    pending.remove(stage.name)
+                    try:
+                        self._complete(stage, *self._run_stage(stage))
+                    except BaseException as e:
+                        error = e
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    used_resources.difference_update(stage.resources)
+                    try:
+                        self._complete(stage, *future.result())
+                    except BaseException as e:
+                        error = error or e
+
+        output(
+            "Stage time: "
+            + ", ".join(f"{name} {sec:.2f}s" for name, sec in self.timings.items())
+        )
+        if error is not None:
+            # Running stages could change input files after the last saved completion
+            self._save_state(finished=False)
+            raise error
+        self._save_state(finished=True)
+        return self.results
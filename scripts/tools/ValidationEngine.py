@@ -0,0 +1,139 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+from .Advancement import Advancement, AdvancementsManager, InvalidAdvancement
+from .Functions import FuncMixin
+from .MissingTranslationFinder import MissingTranslationFinder
+from .Validator import Validator
+from .Warnings import AdvWarning, AdvWarningType
+
+
+def _init_worker(mc_path_not_empty: set[str]) -> None:
+    FuncMixin._mc_path_not_empty.update(mc_path_not_empty)
+    AdvancementsManager.generate()
+
+
+def _validate_paths(
+    paths: list[Path],
+) -> tuple[list[list[AdvWarning]], dict[str, float], set[str], dict[str, tuple]]:
+    """
+    Validates advancements of a shard in a worker process.
+    :param paths: Paths of advancements.
+    :return: Warnings of each advancement, timings of validators,
+    mc_paths of function files, which were found not empty, and validation cache entries.
+    """
+    Validator.reset_timings()
+    warnings = [ValidationEngine.validate(AdvancementsManager[path]) for path in paths]
+    return (
+        warnings,
+        Validator.reset_timings(),
+        FuncMixin._mc_path_not_empty,
+        Validator.get_cache_entries(paths),
+    )
+
+
+class ValidationEngine:
+    """
+    Runs all checks of advancements, in the current process or sharded across worker processes.
+    Results are always returned in the order of given advancements.
+    """
+
+    # Fewer advancements are validated in the current process
+    _min_advancements_to_shard = 100
+    # Shards per worker, more shards balance the load better
+    _shards_per_worker = 4
+
+    @staticmethod
+    def validate(adv: Advancement | InvalidAdvancement) -> list[AdvWarning]:
+        """
+        Validates the advancement and searches its missing translations.
+        :param adv: The advancement.
+        :return: List of warnings.
+        """
+        warnings = Validator.validate_advancement(adv)
+        if not isinstance(adv, InvalidAdvancement):
+            start = time.perf_counter()
+            warnings.extend(MissingTranslationFinder.find_missing_translations(adv))
+            Validator.timings["translation"] += time.perf_counter() - start
+        return warnings
+
+    @classmethod
+    def validate_all(
+        cls,
+        advancements: Sequence[Advancement | InvalidAdvancement],
+        workers: int = 0,
+    ) -> tuple[list[list[AdvWarning]], dict[str, float]]:
+        """
+        Validates advancements.
+        :param advancements: Advancements to validate.
+        :param workers: Number of worker processes. 0 or 1 means validating in the current process.
+        :return: Warnings of each advancement and accumulated timings of validators in seconds.
+        """
+        Validator.reset_timings()
+        if workers <= 1 or len(advancements) < cls._min_advancements_to_shard:
+            warnings = [cls.validate(adv) for adv in advancements]
+            cls._recheck_empty_files(advancements, warnings)
+            Validator.save_cache()
+            return warnings, Validator.reset_timings()
+
+        paths = [adv.path for adv in advancements]
+        shard_size = -(-len(paths) // (workers * cls._shards_per_worker))
+        shards = [
+            paths[start : start + shard_size]
+            for start in range(0, len(paths), shard_size)
+        ]
+
+        warnings = []
+        timings: dict[str, float] = {}
+        # Validation may run in a thread of a release pipeline, while other threads
+        # hold locks, so workers are spawned instead of forked (see _init_worker)
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(set(FuncMixin._mc_path_not_empty),),
+        ) as executor:
+            for (
+                shard_warnings,
+                shard_timings,
+                mc_path_not_empty,
+                cache_entries,
+            ) in executor.map(_validate_paths, shards):
+                warnings.extend(shard_warnings)
+                FuncMixin._mc_path_not_empty.update(mc_path_not_empty)
+                Validator.update_cache(cache_entries)
+                for name, seconds in shard_timings.items():
+                    timings[name] = timings.get(name, 0.0) + seconds
+
+        cls._recheck_empty_files(advancements, warnings)
+        Validator.save_cache()
+        return warnings, timings
+
+    @staticmethod
+    def _recheck_empty_files(
+        advancements: Sequence[Advancement | InvalidAdvancement],
+        warnings: list[list[AdvWarning]],
+    ) -> None:
+        """
+        A function file is empty only if no datapack has content for its mc_path.
+        Advancements (or shards) validated later could find the content,
+        so EMPTY_FILES warnings are replaced by the result of a new check.
+        :param warnings: Warnings of each advancement, changed in place.
+        :return: None
+        """
+        for adv, adv_warnings in zip(advancements, warnings):
+            indexes = [
+                i
+                for i, warning in enumerate(adv_warnings)
+                if warning.warning_type == AdvWarningType.EMPTY_FILES
+            ]
+            if not indexes:
+                continue
+            for i in reversed(indexes):
+                del adv_warnings[i]
+            adv_warnings[indexes[0] : indexes[0]] = Validator._validate_reward_function(
+                adv
+            )
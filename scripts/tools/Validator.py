@@ -1,13 +1,20 @@
+import hashlib
 import json
 import re
+import time
+from collections import defaultdict
+from functools import lru_cache
 from itertools import chain
 from pathlib import Path
-from typing import Set, Literal, List, Tuple
+from typing import Set, Literal, List, Tuple, Iterable, Iterator
 
 import titlecase
 
+from .AhoCorasick import AhoCorasick
 from .Advancement import Advancement, AdvancementsManager, InvalidAdvancement
+from .Cache import PersistentCache
 from .Datapack import DatapackList, Datapack
+from .Functions import FunctionFileCache
 from .Resources import ItemProperties
 from .Warnings import AdvWarningType, AdvWarning
 from .utils import can_access_keypath, cut_namespace
@@ -15,6 +22,123 @@ from .utils import get_by_keypath
 
 
 class Validator:
+    # Validator name -> accumulated time in seconds, see reset_timings()
+    timings: dict[str, float] = defaultdict(float)
+
+    # Advancement path -> (cache key, validator name -> warnings)
+    _cache = PersistentCache("validation")
+    # Validators, which results depend only on the advancement, its function files and resources.
+    # Others depend on other advancements and always run.
+    _cached_validators = frozenset(("spelling",))
+    _resources_hash: str | None = None
+
+    @classmethod
+    def _get_validators(cls):
+        """
+        Returns validators of a valid advancement in the order of their warnings.
+        Each validator returns a warning, a list of warnings or None.
+        """
+        return (
+            ("reward_function", cls._validate_reward_function),
+            ("parent", cls._validate_parent),
+            ("branch", cls._validate_branch_existence),
+            ("spelling", SpellingValidator.validate_misspelling),
+        )
+
+    @classmethod
+    def reset_timings(cls) -> dict[str, float]:
+        """
+        Resets accumulated timings of validators.
+        :return: Timings before the reset.
+        """
+        timings = dict(cls.timings)
+        cls.timings.clear()
+        return timings
+
+    @classmethod
+    def _get_resources_hash(cls) -> str:
+        """
+        Returns a hash of spelling lists and item names, which cached results depend on.
+        """
+        if cls._resources_hash is None:
+            resources = [
+                sorted(SpellingValidator.capitalized),
+                sorted(SpellingValidator.capitalized_ignore),
+                sorted(SpellingValidator.with_the),
+                sorted(SpellingValidator.with_the_ignore),
+                SpellingValidator.max_title_length,
+                ItemProperties.names_list,
+            ]
+            cls._resources_hash = hashlib.sha1(
+                json.dumps(resources).encode()
+            ).hexdigest()
+        return cls._resources_hash
+
+    @classmethod
+    def _get_cache_key(cls, adv: Advancement) -> str:
+        """
+        Returns a hash of the advancement's json, its function files and resources.
+        """
+        key = hashlib.sha1(cls._get_resources_hash().encode())
+        key.update(adv.datapack.blacklisted_symbols.encode())
+        key.update(json.dumps(adv.json, sort_keys=True).encode())
+        for path in (
+            adv.functions.main_path,
+            adv.functions.exp_path,
+            adv.functions.msg_path,
+            adv.functions.reward_path,
+            adv.functions.trophy_path,
+        ):
+            content = FunctionFileCache.read(path, adv.datapack.encoding)
+            content = b"\0" if content is None else content.encode()
+            key.update(len(content).to_bytes(8, "little"))
+            key.update(content)
+        return key.hexdigest()
+
+    @classmethod
+    def _get_cache_entry(
+        cls, adv: Advancement
+    ) -> tuple[str, dict[str, list[AdvWarning]]]:
+        """
+        Returns the cache key and cached results of validators for the advancement.
+        Results are dropped if the advancement or something it depends on has changed.
+        """
+        cache_key = cls._get_cache_key(adv)
+        entry = cls._cache.get(str(adv.path))
+        if entry is None or entry[0] != cache_key:
+            entry = (cache_key, {})
+        return entry
+
+    @classmethod
+    def get_cache_entries(cls, paths: Iterable[Path]) -> dict[str, tuple]:
+        """
+        Returns cache entries of advancements, used to pass them from worker processes.
+        """
+        return {
+            str(path): cls._cache[str(path)]
+            for path in paths
+            if str(path) in cls._cache
+        }
+
+    @classmethod
+    def update_cache(cls, entries: dict[str, tuple]) -> None:
+        for path, entry in entries.items():
+            cls._cache[path] = entry
+
+    @classmethod
+    def save_cache(cls) -> None:
+        """
+        Writes cached results to the disk, results of removed advancements are dropped.
+        :return: None
+        """
+        cls._cache.retain(
+            str(adv.path)
+            for adv in AdvancementsManager.filtered_iterator(
+                datapack=(), skip_technical=False, skip_invalid=False
+            )
+        )
+        cls._cache.save()
+
     @classmethod
     def validate_advancement(
         cls, advancement: Advancement | InvalidAdvancement
@@ -28,20 +152,30 @@ class Validator:
             ]
 
         warnings = []
-
-        result = cls._validate_reward_function(advancement)
-        if result:
-            warnings.extend(result)
-
-        result = cls._validate_parent(advancement)
-        if result:
-            warnings.append(result)
-
-        if advancement.tab in advancement.datapack.tabs_have_branch:
-            result = cls._validate_branch_existence(advancement)
-            if result:
+        cache_entry = None
+
+        for name, validator in cls._get_validators():
+            start = time.perf_counter()
+            if name in cls._cached_validators:
+                if cache_entry is None:
+                    cache_entry = cls._get_cache_entry(advancement)
+                cache_key, cached_results = cache_entry
+                if name not in cached_results:
+                    result = validator(advancement)
+                    if isinstance(result, AdvWarning):
+                        result = [result]
+                    cached_results = {**cached_results, name: result or []}
+                    cache_entry = (cache_key, cached_results)
+                    cls._cache[str(advancement.path)] = cache_entry
+                result = cached_results[name]
+            else:
+                result = validator(advancement)
+            cls.timings[name] += time.perf_counter() - start
+
+            if isinstance(result, AdvWarning):
                 warnings.append(result)
-        warnings.extend(SpellingValidator.validate_misspelling(advancement))
+            elif result:
+                warnings.extend(result)
 
         return warnings
 
@@ -108,40 +242,6 @@ class Validator:
             )
         return
 
-    @staticmethod
-    def _find_last_advancement(adv: Advancement) -> Advancement:
-        """
-        Finds the last advancement in the chain starting from the given advancement.
-        This method follows the parent chain until it reaches the root.
-        :param adv: The starting advancement.
-        :return: The last advancement in the chain.
-        """
-        adv_map = {
-            adv.mc_path: adv
-            for adv in AdvancementsManager.filtered_iterator(
-                datapack=DatapackList.available, skip_technical=False
-            )
-        }
-
-        while adv.parent in adv_map:
-            adv = adv_map[adv.parent]
-
-        return adv
-
-    @staticmethod
-    def _find_root_advancement(adv: Advancement) -> Advancement:
-        """
-        Recursively finds the root advancement by traversing through parents until a non-hidden challenge is found.
-        """
-        while adv.hidden:
-            parent_advancements = AdvancementsManager.find(
-                {"mc_path": adv.parent}, datapack=DatapackList.available, limit=1
-            )
-            if not parent_advancements:
-                break
-            adv = parent_advancements[0]
-        return adv
-
     @classmethod
     def _validate_branch_existence(cls, adv: Advancement) -> AdvWarning | None:
         """
@@ -150,24 +250,13 @@ class Validator:
         :param adv: The advancement to check.
         :return: List of warning advancements.
         """
-
-        last_adv = cls._find_last_advancement(adv)
-
-        branch_parent_list = {
-            tech_adv.parent
-            for tech_adv in AdvancementsManager.filtered_iterator(
-                datapack=DatapackList.available, skip_technical=False
+        if adv.tab not in adv.datapack.tabs_have_branch:
+            return
+        if not AdvancementsManager.graph().is_in_branch(adv):
+            return AdvWarning(
+                AdvWarningType.MISSING_BRANCH,
+                f"Doesn't have branch in {adv.tab} tab",
             )
-            if tech_adv.parent
-        }
-
-        if last_adv.mc_path not in branch_parent_list:
-            root_adv = cls._find_root_advancement(last_adv)
-            if root_adv.mc_path not in branch_parent_list:
-                return AdvWarning(
-                    AdvWarningType.MISSING_BRANCH,
-                    f"Doesn't have branch in {adv.tab} tab",
-                )
 
         return
 
@@ -228,6 +317,66 @@ class Validator:
         return warnings
 
 
+class TextValidator:
+    """
+    Checks of texts, which depend on settings of a datapack.
+    Patterns are compiled once and shared by datapacks with the same settings, see get().
+    """
+
+    _instances: dict[str, "TextValidator"] = {}
+    # Matches a pattern, which allows a string of chars from one class: ^[...]+$
+    _char_class_pattern = re.compile(r"\^(\[[^\]]+\])\+\$")
+
+    def __init__(self, blacklisted_symbols: str):
+        """
+        :param blacklisted_symbols: Pattern, which a valid string matches.
+        """
+        self._pattern = re.compile(blacklisted_symbols)
+        self._always_valid = not blacklisted_symbols
+        # Finds all chars, which don't match the pattern, in one scan
+        self._invalid_char_pattern: re.Pattern | None = None
+
+        char_class = self._char_class_pattern.fullmatch(blacklisted_symbols)
+        if char_class:
+            self._invalid_char_pattern = re.compile(
+                rf"(?!{char_class.group(1)})(?s:.)"
+            )
+
+    @classmethod
+    def get(cls, datapack: Datapack) -> "TextValidator":
+        validator = cls._instances.get(datapack.blacklisted_symbols)
+        if validator is None:
+            validator = cls(datapack.blacklisted_symbols)
+            cls._instances[datapack.blacklisted_symbols] = validator
+        return validator
+
+    def find_invalid_symbols(self, string: str) -> List[Tuple[int, str]]:
+        """
+        Returns chars, which don't match the pattern, if the whole string doesn't match it.
+        :param string: String to check.
+        :return: List of (position, char).
+        """
+        if self._always_valid or self._pattern.match(string):
+            return []
+        if self._invalid_char_pattern is not None:
+            return [
+                (match.start(), match.group())
+                for match in self._invalid_char_pattern.finditer(string)
+            ]
+        return [
+            (i, char) for i, char in enumerate(string) if not self._pattern.search(char)
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def titlecase(string: str) -> str:
+        return titlecase.titlecase(string)
+
+    @classmethod
+    def is_valid_title_case(cls, string: str) -> bool:
+        return string.rstrip("\n") == cls.titlecase(string.rstrip("\n"))
+
+
 class SpellingValidator:
     capitalized: Set[str] = set(
         json.loads(Path("resources/spelling/capitalized.json").read_text())
@@ -247,6 +396,72 @@ class SpellingValidator:
 
     max_title_length: int = 32
 
+    # Matchers are built once on first use, see _build_matchers
+    _capitalized_phrases: list[str] = []
+    _with_the_phrases: list[str] = []
+    _capitalized_ignore_matcher: AhoCorasick | None = None
+    _capitalized_matcher: AhoCorasick | None = None
+    _with_the_ignore_matcher: AhoCorasick | None = None
+    _with_the_matcher: AhoCorasick | None = None
+
+    @classmethod
+    def _build_matchers(cls) -> None:
+        if cls._capitalized_matcher is not None:
+            return
+        cls._capitalized_phrases = list(cls.capitalized)
+        cls._with_the_phrases = list(cls.with_the)
+
+        cls._capitalized_ignore_matcher = AhoCorasick(
+            chain(ItemProperties.names_list, cls.capitalized_ignore)
+        )
+        # Each phrase has two patterns: the phrase and its plural form
+        cls._capitalized_matcher = AhoCorasick(
+            pattern
+            for phrase in cls._capitalized_phrases
+            for pattern in (phrase.lower(), phrase.lower() + "s")
+        )
+        cls._with_the_ignore_matcher = AhoCorasick(cls.with_the_ignore)
+        cls._with_the_matcher = AhoCorasick(cls._with_the_phrases)
+
+    @staticmethod
+    def _is_word_boundary(string: str, index: int) -> bool:
+        """
+        Works as `\\b` in re: checks if only one of the chars around the index is a word char.
+        """
+        before = string[index - 1 : index] if index else ""
+        after = string[index : index + 1]
+        return (before.isalnum() or before == "_") != (after.isalnum() or after == "_")
+
+    @classmethod
+    def _iter_phrase_matches(
+        cls, string: str, matcher: AhoCorasick, phrases_count: int, variants: int = 1
+    ) -> Iterator[tuple[int, int, int]]:
+        """
+        Finds phrases surrounded by word boundaries in one pass.
+        Matches are yielded like `re.finditer` was called for each phrase in their order.
+        :param string: String to search in.
+        :param matcher: Matcher, which has `variants` consecutive patterns for each phrase.
+        Variants of a phrase are tried in their order.
+        :param phrases_count: Number of phrases.
+        :param variants: Number of patterns per phrase.
+        :return: Iterator of (phrase index, start, end).
+        """
+        phrase_matches = [[] for _ in range(phrases_count)]
+        for start, end, index in matcher.iter_matches(string):
+            if cls._is_word_boundary(string, start) and cls._is_word_boundary(
+                string, end
+            ):
+                phrase_index, variant = divmod(index, variants)
+                phrase_matches[phrase_index].append((start, variant, end))
+
+        for phrase_index, matches in enumerate(phrase_matches):
+            position = 0
+            for start, _, end in sorted(matches):
+                # Like re.finditer, matches of one phrase don't overlap
+                if start >= position:
+                    position = end
+                    yield phrase_index, start, end
+
     @classmethod
     def validate_misspelling(cls, adv: Advancement) -> List[AdvWarning]:
         """
@@ -265,17 +480,42 @@ class SpellingValidator:
         warnings.extend(cls._validate_clean_edges(adv.description, "description"))
         warnings.extend(cls._validate_wrong_symbols_in_fields(adv))
         if (
-            not cls._is_valid_title_case(adv.title)
+            not TextValidator.is_valid_title_case(adv.title)
             and adv.title not in cls.capitalized_ignore
         ):
             warnings.append(
                 AdvWarning(
                     AdvWarningType.MISSPELLING_ERROR,
-                    f'Title "{adv.title}" is not written in "Title Case", correct variant: "{titlecase.titlecase(adv.title)}"',
+                    f'Title "{adv.title}" is not written in "Title Case", correct variant: "{TextValidator.titlecase(adv.title)}"',
                 )
             )
         return warnings
 
+    @classmethod
+    def _iter_capitalized_matches(
+        cls, string: str
+    ) -> Iterator[tuple[str, str, int, int]]:
+        """
+        Finds phrases from `capitalized` and their plural forms ignoring case.
+        :return: Iterator of (phrase, matched text, start, end).
+        """
+        if string.isascii():
+            for phrase_index, start, end in cls._iter_phrase_matches(
+                string.lower(),
+                cls._capitalized_matcher,
+                len(cls._capitalized_phrases),
+                variants=2,
+            ):
+                phrase = cls._capitalized_phrases[phrase_index]
+                yield phrase, string[start:end], start, end
+            return
+
+        # Case folding of re differs from str.lower() for some non-ASCII chars
+        for phrase in cls._capitalized_phrases:
+            pattern = rf"\b{re.escape(phrase)}\b|\b{re.escape(phrase)}s\b"
+            for match in re.finditer(pattern, string, re.IGNORECASE):
+                yield phrase, match.group(), *match.span()
+
     @classmethod
     def _validate_capitalized(
         cls, string: str, place: Literal["title", "description"]
@@ -283,35 +523,31 @@ class SpellingValidator:
 
         warnings = []
 
-        for item_name in chain(ItemProperties.names_list, cls.capitalized_ignore):
-            string = string.replace(item_name, "")
-        for phrase in cls.capitalized:
-            pattern = rf"\b{re.escape(phrase)}\b|\b{re.escape(phrase)}s\b"
-            matches = re.finditer(pattern, string, re.IGNORECASE)
-
-            for match in matches:
-                original_phrase = match.group()
-                start_index, end_index = match.span()
-
-                if original_phrase == phrase.title() or (
-                    original_phrase.endswith("s")
-                    and original_phrase[:-1] == phrase.title()
-                ):
-                    continue
+        cls._build_matchers()
+        string = cls._capitalized_ignore_matcher.remove_all(string)
 
-                if (
-                    phrase == "end"
-                    and start_index > 0
-                    and string[start_index - 4 : start_index].lower() != "the "
-                ):
-                    continue
+        for phrase, original_phrase, start_index, end_index in (
+            cls._iter_capitalized_matches(string)
+        ):
+            if original_phrase == phrase.title() or (
+                original_phrase.endswith("s")
+                and original_phrase[:-1] == phrase.title()
+            ):
+                continue
+
+            if (
+                phrase == "end"
+                and start_index > 0
+                and string[start_index - 4 : start_index].lower() != "the "
+            ):
+                continue
 
-                warnings.append(
-                    AdvWarning(
-                        AdvWarningType.MISSPELLING_ERROR,
-                        f'Phrase "{original_phrase}" at {start_index}:{end_index} should be written in Title Format in {place}',
-                    )
+            warnings.append(
+                AdvWarning(
+                    AdvWarningType.MISSPELLING_ERROR,
+                    f'Phrase "{original_phrase}" at {start_index}:{end_index} should be written in Title Format in {place}',
                 )
+            )
 
         return warnings
 
@@ -320,34 +556,31 @@ class SpellingValidator:
         cls, string: str, place: Literal["title", "description"]
     ) -> List[AdvWarning]:
 
-        lowered_string = string.lower()
         warnings = []
 
-        for ignore_phrase in cls.with_the_ignore:
-            lowered_string = lowered_string.replace(ignore_phrase, "")
-
-        for phrase in cls.with_the:
-            pattern = rf"\b{re.escape(phrase)}\b"
-            matches = re.finditer(pattern, lowered_string)
+        cls._build_matchers()
+        lowered_string = cls._with_the_ignore_matcher.remove_all(string.lower())
 
-            for match in matches:
-                start_index, end_index = match.span()
+        for phrase_index, start_index, end_index in cls._iter_phrase_matches(
+            lowered_string, cls._with_the_matcher, len(cls._with_the_phrases)
+        ):
+            phrase = cls._with_the_phrases[phrase_index]
 
-                if phrase == "end" and string[start_index:end_index] == "end":
-                    continue
+            if phrase == "end" and string[start_index:end_index] == "end":
+                continue
 
-                if (
-                    start_index > 0
-                    and lowered_string[start_index - 4 : start_index] == "the "
-                ):
-                    continue
+            if (
+                start_index > 0
+                and lowered_string[start_index - 4 : start_index] == "the "
+            ):
+                continue
 
-                warnings.append(
-                    AdvWarning(
-                        AdvWarningType.MISSPELLING_ERROR,
-                        f'Phrase "{phrase}" at {start_index}:{end_index} should be written with "the" before it in {place}',
-                    )
+            warnings.append(
+                AdvWarning(
+                    AdvWarningType.MISSPELLING_ERROR,
+                    f'Phrase "{phrase}" at {start_index}:{end_index} should be written with "the" before it in {place}',
                 )
+            )
 
         return warnings
 
@@ -386,19 +619,9 @@ class SpellingValidator:
 
         return warnings
 
-    @staticmethod
-    def _validate_with_pattern(
-        string: str, re_pattern: re.Pattern
-    ) -> List[Tuple[int, str]]:
-        if re_pattern.match(string):
-            return []
-        return [
-            (i, char) for i, char in enumerate(string) if not re_pattern.search(char)
-        ]
-
     @classmethod
     def _validate_wrong_symbols_in_fields(cls, adv: Advancement):
-        pattern = re.compile(adv.datapack.blacklisted_symbols)
+        text_validator = TextValidator.get(adv.datapack)
         warnings = []
 
         fields = {
@@ -413,7 +636,7 @@ class SpellingValidator:
             fields[f"Criterion {crt.name}"] = crt.name
 
         for field_name, field_value in fields.items():
-            invalid_positions = cls._validate_with_pattern(field_value, pattern)
+            invalid_positions = text_validator.find_invalid_symbols(field_value)
 
             if invalid_positions:
                 message = (
@@ -432,10 +655,6 @@ class SpellingValidator:
 
         return warnings
 
-    @staticmethod
-    def _is_valid_title_case(string: str) -> bool:
-        return string.rstrip("\n") == titlecase.titlecase(string.rstrip("\n"))
-
     @classmethod
     def validate_title(cls, title: str, datapack: Datapack) -> list[AdvWarning]:
         warnings = []
@@ -448,8 +667,7 @@ class SpellingValidator:
                 )
             )
 
-        pattern = re.compile(datapack.blacklisted_symbols)
-        if cls._validate_with_pattern(title, pattern):
+        if TextValidator.get(datapack).find_invalid_symbols(title):
             warnings.append(
                 AdvWarning(
                     AdvWarningType.WRONG_SYMBOLS, f"Title has blacklisted symbols"
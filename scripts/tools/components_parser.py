@@ -1,82 +1,58 @@
+from functools import lru_cache
 from typing import Dict, Any
 
-from .nbt_parser import nbt_decoder, nbt_encoder
-from .utils import cut_namespace
+from .nbt_parser import SnbtParser, nbt_write
+from .utils import copy_json, cut_namespace
 
 
-def item_components_decoder(input_str: str) -> Dict[str, Any]:
+class ComponentsParser(SnbtParser):
     """
-    Translate components to dict.
-    :param input_str: Component.
-    :return: Dict.
+    Parser of item components ([key=value, ...]), values are parsed as snbt
+    while the components are walked, so the string is tokenized only once.
     """
-    input_str = input_str[1:-1]
-    result = {}
-    current_key = ""
-    current_value = ""
-    in_key = True
-    in_value = False
-    brace_counter = 0
-    signature = {"'": "'", '"': '"', "{": "}", "[": "]"}
-    current_quote = None
-    is_escaping = False
-    i = 0
 
-    while i < len(input_str):
-        char = input_str[i]
-        if in_key:
-            if char == "=":
-                current_key = cut_namespace(current_key)
-                in_key = False
-                in_value = True
-            elif char not in [",", " "]:
-                current_key += char
-        elif in_value:
-            if is_escaping:
-                current_value += char
-                is_escaping = False
-            elif char == "\\":
-                is_escaping = True
-                current_value += char
-            elif current_quote is None:
-                if char == " ":
-                    pass
-                elif char == ",":
-                    result[current_key.strip()] = current_value.strip()
-                    current_key = ""
-                    current_value = ""
-                    in_key = True
-                    in_value = False
-                    current_quote = None
-                elif char in signature.keys():
-                    current_quote = char
-                    current_value += char
-                    brace_counter += 1
-                else:
-                    current_value += char
-            elif char == signature[current_quote]:
-                current_value += char
-                brace_counter -= 1
-                if brace_counter == 0:
-                    result[current_key.strip()] = current_value.strip()
-                    current_key = ""
-                    current_value = ""
-                    in_key = True
-                    in_value = False
-                    current_quote = None
-            elif char == current_quote:
-                current_value += char
-                brace_counter += 1
+    def parse(self) -> Dict[str, Any]:
+        if self._next()[0] != "[":
+            raise ValueError("Components must start with '['")
+
+        result = {}
+        kind, value = self._next()
+        while kind != "]":
+            # Keys can have a namespace, which is split to several tokens
+            key = ""
+            while kind != "=":
+                if kind != "bare" and kind != ":":
+                    raise ValueError(f"Unexpected token in key: {value}")
+                key += value
+                kind, value = self._next()
+            result[cut_namespace(key)] = self._parse_value(self._next())
 
-            else:
-                current_value += char
-        i += 1
+            kind, value = self._next()
+            if kind == ",":
+                kind, value = self._next()
+            elif kind != "]":
+                raise ValueError(f"Unexpected token: {value}")
 
-    if current_key:
-        result[current_key.strip()] = current_value.strip()
+        if self._pos != len(self._tokens) - 1:
+            raise ValueError(f"Unexpected token: {self._tokens[self._pos][1]}")
+        return result
 
-    result = {k: nbt_decoder(v) for k, v in result.items()}
-    return result
+
+@lru_cache(maxsize=4096)
+def _decode_cached(input_str: str) -> Dict[str, Any]:
+    return ComponentsParser(input_str).parse()
+
+
+def item_components_decoder(input_str: str) -> Dict[str, Any]:
+    """
+    Translate components to dict.
+    :param input_str: Component.
+    :return: Dict, callers are free to change it.
+    """
+    try:
+        return copy_json(_decode_cached(input_str))
+    except Exception as err:
+        raise ValueError(f'Can\'t decode components: "{input_str}"\n{err}')
 
 
 def item_components_encoder(input_dict: Dict) -> str:
@@ -86,14 +62,13 @@ def item_components_encoder(input_dict: Dict) -> str:
     :param input_dict: Dict to translate.
     :return: Components.
     """
-
-    #  add_quotes mean what components will be wrapped in ''
-    #  If value is true, it's mean what each element of this one will be wrapped
-
-    components = []
+    buffer = ["["]
     for key, value in input_dict.items():
-        value = nbt_encoder(value)
-        components.append(f"{key}={value}")
-
-    encoded_str = "[" + ", ".join(components) + "]"
-    return encoded_str
+        buffer.append(f"{key}=")
+        nbt_write(value, buffer)
+        buffer.append(", ")
+    if input_dict:
+        buffer[-1] = "]"
+    else:
+        buffer.append("]")
+    return "".join(buffer)
@@ -3,6 +3,7 @@ from pathlib import Path
 
 from .Advancement import AdvancementsManager, Advancement
 from .Datapack import DatapackList
+from .FileWriter import FileWriter
 from .InterfaceSchema import get_value
 from .Resources import ItemProperties
 from .utils import cut_namespace
@@ -19,18 +20,25 @@ def generate_type(adv: Advancement):
 def generate_requirements():
     req_path = Path("pages/assets/requirements.json")
     if not req_path.exists():
-        req_path.write_text(json.dumps({}), encoding=DatapackList.default.encoding)
+        FileWriter.write_text(
+            req_path, json.dumps({}), encoding=DatapackList.default.encoding
+        )
     data = json.loads(req_path.read_text(encoding=DatapackList.default.encoding))
     for adv in AdvancementsManager.filtered_iterator(datapack=DatapackList.default):
         if adv.mc_path not in data:
             data[adv.mc_path] = ""
-    req_path.write_text(
+    FileWriter.write_text(
+        req_path,
         json.dumps(data, indent=2, ensure_ascii=False),
         encoding=DatapackList.default.encoding,
     )
 
 
-def create():
+def create(version: str = None):
+    """
+    Writes data of advancements for the site to pages/ver/{version}/data.json.
+    :param version: Release version, asked in the console if it isn't set.
+    """
     generate_requirements()
     data = []
     req_data = json.loads(
@@ -58,10 +66,11 @@ def create():
                 "req": req_data.get(adv.mc_path, ""),
             }
         )
-    ver = get_value("Release version (ex. 2.2.3):")
+    ver = version or get_value("Release version (ex. 2.2.3):")
     path = Path(f"pages/ver/{ver.replace('.', '_')}/data.json")
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
+    FileWriter.write_text(
+        path,
         json.dumps(data, indent=2, ensure_ascii=False),
         encoding=DatapackList.default.encoding,
     )
@@ -1,8 +1,9 @@
 import re
+from functools import lru_cache
 from typing import Union, Dict, List, Any
 
 from .Color import Color
-from .utils import cut_namespace
+from .utils import copy_json, cut_namespace
 
 
 is_decimal_pattern = re.compile(r"(-?\d+)s?")
@@ -11,195 +12,260 @@ is_float_pattern = re.compile(r"(-?\d*.?\d*)[fd]")
 
 
 def get_decimal(s: str) -> str | None:
-    match = re.fullmatch(is_decimal_pattern, s)
+    match = is_decimal_pattern.fullmatch(s)
     if not match:
         return None
     return match.group(1)
 
 
 def get_float(s: str) -> str | None:
-    match = re.fullmatch(is_float_pattern, s)
+    match = is_float_pattern.fullmatch(s)
     if not match:
         return None
     return match.group(1)
 
 
 def is_like_enum(s: str) -> bool:
-    return re.fullmatch(is_like_enum_pattern, s) is not None
+    return is_like_enum_pattern.fullmatch(s) is not None
+
+
+# Whitespace is skipped, any other character, which can't start a token, is an error
+_token_pattern = re.compile(
+    r"""\s*(?:
+        (?P<punct>[{}\[\],:;=])
+        |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<bare>[^\s{}\[\],:;="']+)
+        |(?P<error>.)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+# Backslash escapes the next character, any escaped character is kept as is
+_escape_pattern = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _tokenize(input_str: str) -> list[tuple[str, str]]:
+    """
+    Splits snbt to tokens in one pass.
+    :param input_str: Snbt.
+    :return: List of (kind, value). Kind of punctuation is the character itself,
+    value of a string is unescaped and unquoted. The list ends with ("", "").
+    """
+    tokens = []
+    for punct, string, bare, error in _token_pattern.findall(input_str):
+        if punct:
+            tokens.append((punct, punct))
+        elif bare:
+            tokens.append(("bare", bare))
+        elif string:
+            string = string[1:-1]
+            if "\\" in string:
+                string = _escape_pattern.sub(r"\1", string)
+            tokens.append(("string", string))
+        else:
+            raise ValueError(f"Unexpected character: {error}")
+    tokens.append(("", ""))
+    return tokens
+
+
+def _convert_bare(value: str) -> Union[str, bool, float, int]:
+    """
+    Converts unquoted value (number, boolean or enum-like string).
+    """
+    # Fast path for plain integers, which are the most common values
+    digits = value[1:] if value.startswith("-") else value
+    if digits.isascii() and digits.isdigit():
+        return int(value)
+    if value.endswith("b"):
+        return bool(int(value[:-1]))
+    elif value.lower() in ("false", "true"):
+        return True if value == "true" else False
+    elif v := get_float(value):
+        return float(v)
+    elif v := get_decimal(value):
+        return int(v)
+    elif is_like_enum(value):
+        return str(value)
+    else:
+        raise ValueError(f"Undefined type: {value}")
+
+
+def _convert_string(value: str) -> Union[list, dict, str]:
+    """
+    Converts quoted value. Strings, which look like a compound or a list
+    (e.g. text-json components), are parsed, if it's possible.
+    """
+    if (value.startswith("{") and value.endswith("}")) or (
+        value.startswith("[") and value.endswith("]")
+    ):
+        try:
+            return SnbtParser(value).parse()
+        except ValueError:
+            pass
+    return value
+
+
+class SnbtParser:
+    """
+    Recursive descent parser over tokens of snbt.
+    The input is tokenized once, parsers of other formats built on snbt extend
+    this class.
+    """
+
+    def __init__(self, input_str: str):
+        self._tokens = _tokenize(input_str)
+        self._pos = 0
+
+    def _next(self) -> tuple[str, str]:
+        token = self._tokens[self._pos]
+        if not token[0]:
+            raise ValueError("Unexpected end of nbt")
+        self._pos += 1
+        return token
+
+    def parse(self) -> Any:
+        value = self._parse_value(self._next())
+        if self._pos != len(self._tokens) - 1:
+            raise ValueError(f"Unexpected token: {self._tokens[self._pos][1]}")
+        return value
+
+    def _parse_value(self, token: tuple[str, str]) -> Any:
+        kind, value = token
+        if kind == "{":
+            return self._parse_compound()
+        elif kind == "[":
+            return self._parse_list()
+        elif kind == "string":
+            return _convert_string(value)
+        elif kind == "bare":
+            return _convert_bare(value)
+        raise ValueError(f"Unexpected token: {value}")
+
+    def _parse_compound(self) -> dict:
+        result = {}
+        kind, key = self._next()
+        while kind != "}":
+            if kind != "string" and kind != "bare":
+                raise ValueError(f"Unexpected token: {key}")
+            if self._next()[0] != ":":
+                raise ValueError(f"Expected ':' after key: {key}")
+            result[cut_namespace(key)] = self._parse_value(self._next())
+
+            kind, key = self._next()
+            if kind == ",":
+                kind, key = self._next()
+            elif kind != "}":
+                raise ValueError(f"Unexpected token: {key}")
+        return result
+
+    def _parse_list(self) -> list:
+        result = []
+        token = self._next()
+        # Typed arrays ([B;...], [I;...], [L;...]) are parsed as lists
+        if (
+            token[0] == "bare"
+            and len(token[1]) == 1
+            and self._tokens[self._pos][0] == ";"
+        ):
+            self._pos += 1
+            token = self._next()
+
+        while token[0] != "]":
+            result.append(self._parse_value(token))
+
+            token = self._next()
+            if token[0] == ",":
+                token = self._next()
+            elif token[0] != "]":
+                raise ValueError(f"Unexpected token: {token[1]}")
+        return result
+
+
+# The same fragments (lore, custom names) repeat across reward and trophy functions.
+# Cached results are shared, so they are copied before they are returned to callers.
+@lru_cache(maxsize=4096)
+def _decode_cached(input_str: str) -> Any:
+    return SnbtParser(input_str).parse()
 
 
 def nbt_decoder(input_str: str) -> Any:
     """
     Translate components to python types.
     :param input_str: Component.
-    :return: Some python type (depends on input).
+    :return: Some python type (depends on input), callers are free to change it.
     """
     try:
-        signature = {"'": "'", '"': '"', "{": "}", "[": "]"}
-
-        def strip_key(key: str) -> str:
-            return key.strip("'").strip('"')
-
-        def remove_escaping_in_string(string: str):
-            return "\\".join((x.replace("\\", "") for x in string.split(r"\\")))
-
-        def convert_type(value: str) -> Union[list, dict, str, bool, float, int]:
-            if value.startswith("[") and value.endswith("]"):
-                return parse_list(value)
-            elif value.startswith("{") and value.endswith("}"):
-                return parse_nbt(value)
-            elif (value.startswith("'") and value.endswith("'")) or (
-                value.startswith('"') and value.endswith('"')
-            ):
-                value = value[1:-1]
-                try:
-                    if value.startswith("{") and value.endswith("}"):
-                        return parse_nbt(remove_escaping_in_string(value))
-                    elif value.startswith("[") and value.endswith("]"):
-                        return parse_list(remove_escaping_in_string(value))
-                except ValueError:
-                    pass
-                return remove_escaping_in_string(value)
-            elif value.endswith("b"):
-                return bool(int(value[:-1]))
-            elif value.lower() in ("false", "true"):
-                return True if value == "true" else False
-            elif v := get_float(value):
-                return float(v)
-            elif v := get_decimal(value):
-                return int(v)
-            elif is_like_enum(value):
-                return str(value)
-            else:
-                raise ValueError(f"Undefined type: {value}")
-
-        def parse_nbt(input_nbt):
-            input_nbt = input_nbt[1:-1]
-            result = {}
-            current_key = ""
-            current_value = ""
-            in_key = True
-            in_value = False
-            brace_counter = 0
-            current_quote = None
-            is_escaping = False
-            i = 0
-            while i < len(input_nbt):
-                char = input_nbt[i]
-                if in_key:
-                    if char in signature.keys() and current_quote is None:
-                        current_quote = char
-                        brace_counter += 1
-                        current_key += char
-                    elif char == signature.get(current_quote):
-                        brace_counter -= 1
-                        current_key += char
-                        if brace_counter == 0:
-                            current_quote = None
-                    elif char == ":" and current_quote is None:
-                        current_key = cut_namespace(current_key)
-                        in_key = False
-                        in_value = True
-                    elif current_quote:
-                        current_key += char
-                    elif char not in [",", " "]:
-                        current_key += char
-                elif in_value:
-                    if is_escaping:
-                        current_value += char
-                        is_escaping = False
-                    elif char == "\\":
-                        current_value += char
-                        is_escaping = True
-                    elif current_quote is None:
-                        if char == " ":
-                            pass
-                        elif char == ",":
-                            current_key = strip_key(current_key)
-                            result[current_key] = convert_type(current_value)
-                            current_key = ""
-                            current_value = ""
-                            in_key = True
-                            in_value = False
-                            current_quote = None
-                        elif char in signature.keys():
-                            current_quote = char
-                            current_value += char
-                            brace_counter += 1
-                        else:
-                            current_value += char
-                    elif char == signature[current_quote]:
-                        current_value += char
-                        brace_counter -= 1
-                        if brace_counter == 0:
-                            current_key = strip_key(current_key)
-                            result[current_key] = convert_type(current_value)
-                            current_key = ""
-                            current_value = ""
-                            in_key = True
-                            in_value = False
-                            current_quote = None
-                    elif char == current_quote:
-                        current_value += char
-                        brace_counter += 1
-                    else:
-                        current_value += char
-                i += 1
-            if current_key:
-                current_key = strip_key(current_key)
-                result[current_key] = convert_type(current_value)
-            return result
-
-        def parse_list(value: str) -> list:
-            value = value[1:-1]
-            if not value:
-                return []
-            if value[1] == ";":
-                value = value.partition(";")[2]
-            result = []
-            current_value = ""
-            brace_counter = 0
-            current_quote = None
-            is_escaping = False
-            i = 0
-            while i < len(value):
-                char = value[i]
-                if is_escaping:
-                    current_value += char
-                    is_escaping = False
-                elif char == "\\":
-                    current_value += char
-                    is_escaping = True
-                elif current_quote is None:
-                    if char in signature.keys():
-                        current_quote = char
-                        brace_counter += 1
-                        current_value += char
-                    elif char == "," and brace_counter == 0:
-                        result.append(convert_type(current_value))
-                        current_value = ""
-                    elif char not in [" ", ","]:
-                        current_value += char
-                elif char == signature[current_quote]:
-                    current_value += char
-                    brace_counter -= 1
-                    if brace_counter == 0:
-                        current_quote = None
-                elif char == current_quote:
-                    current_value += char
-                    brace_counter += 1
-                else:
-                    current_value += char
-                i += 1
-            if current_value:
-                result.append(convert_type(current_value))
-            return result
-
-        return convert_type(input_str)
+        return copy_json(_decode_cached(input_str))
     except Exception as err:
         raise ValueError(f'Can\'t decode nbt string: "{input_str}"\n{err})')
 
 
+# Strings with quotes are mostly JSON text components (lore, custom names),
+# which are encoded again in every reward and trophy function
+@lru_cache(maxsize=4096)
+def _escape_quoted(value: str) -> str:
+    return value.replace("'", "\\'").replace('"', '\\\\"')
+
+
+def _escape_string(value: str) -> str:
+    # Most strings have no quotes, they are returned as is
+    if "'" not in value and '"' not in value:
+        return value
+    return _escape_quoted(value)
+
+
+def _write_value(value: Any, buffer: List[str]) -> None:
+    """
+    Appends parts of encoded value to the buffer.
+    """
+    if isinstance(value, dict):
+        buffer.append("{")
+        for key, item in value.items():
+            buffer.append(_escape_string(key) if isinstance(key, str) else str(key))
+            buffer.append(":")
+            _write_value(item, buffer)
+            buffer.append(",")
+        # The trailing comma is replaced
+        if value:
+            buffer[-1] = "}"
+        else:
+            buffer.append("}")
+    elif isinstance(value, list):
+        buffer.append("[")
+        for item in value:
+            _write_value(item, buffer)
+            buffer.append(",")
+        if value:
+            buffer[-1] = "]"
+        else:
+            buffer.append("]")
+    elif isinstance(value, str):
+        buffer.append(f'"{_escape_string(value)}"')
+    elif isinstance(value, Color):
+        buffer.append(f'"{_escape_string(value.value)}"')
+    elif type(value) is int:
+        buffer.append(str(value))
+    elif isinstance(value, float):
+        buffer.append(f"{value}f")
+    elif isinstance(value, bool):
+        buffer.append("true" if value else "false")
+    else:
+        raise TypeError(f"Unsupported data type: {type(value)}")
+
+
+def nbt_write(nbt: Dict | List | float | int | str, buffer: List[str]) -> None:
+    """
+    Translate python types to mc nbt and append it to the buffer.
+    Encoders of formats built on nbt share one buffer and join it once.
+    :param nbt: Some python-type to convert.
+    :param buffer: List of strings, the result is "".join(buffer).
+    :return: None
+    """
+    try:
+        _write_value(nbt, buffer)
+    except Exception as err:
+        raise ValueError(f"Can't encode nbt string: {nbt}\n{err}")
+
+
 def nbt_encoder(nbt: Dict | List | float | int | str) -> str:
     """
     Translate python types to mc nbt.
@@ -207,64 +273,6 @@ def nbt_encoder(nbt: Dict | List | float | int | str) -> str:
     :param nbt: Some python-type to convert.
     :return: Nbt (str).
     """
-    try:
-
-        def escape_string(value: str) -> str:
-            return value.replace("'", "\\'").replace('"', '\\\\"')
-
-        def convert_dict(data: dict) -> str:
-            result = "{"
-            for key, value in data.items():
-                if isinstance(key, str):
-                    key = escape_string(key)
-                result += f"{key}:{convert_value(value)},"
-            if result.endswith(","):
-                result = result[:-1]
-            result += "}"
-            return result
-
-        def convert_list(data: List) -> str:
-            result = ""
-            for value in data:
-                result += f"{convert_value(value)},"
-            if result.endswith(","):
-                result = result[:-1]
-            result = f"[{result}]"
-            return result
-
-        def convert_string(value: str) -> str:
-            return f'"{escape_string(value)}"'
-
-        def convert_int(value: int) -> str:
-            return str(value)
-
-        def convert_float(value: float) -> str:
-            return f"{value}f"
-
-        def convert_color(value: Color) -> str:
-            return f'"{escape_string(value.value)}"'
-
-        def convert_bool(value: bool) -> str:
-            return "true" if value else "false"
-
-        def convert_value(value: Any) -> str:
-            if isinstance(value, dict):
-                return convert_dict(value)
-            elif isinstance(value, list):
-                return convert_list(value)
-            elif isinstance(value, str):
-                return convert_string(value)
-            elif isinstance(value, Color):
-                return convert_color(value)
-            elif type(value) is int:
-                return convert_int(value)
-            elif isinstance(value, float):
-                return convert_float(value)
-            elif isinstance(value, bool):
-                return convert_bool(value)
-            else:
-                raise TypeError(f"Unsupported data type: {type(value)}\n{nbt}")
-
-        return convert_value(nbt)
-    except Exception as err:
-        return ValueError(f"Can't encode nbt string: {nbt}\n{err}")
+    buffer = []
+    nbt_write(nbt, buffer)
+    return "".join(buffer)
@@ -1,14 +1,58 @@
 import json
+import os
 import re
+import sys
 from pathlib import Path
 from typing import *
 from typing import Dict
 
+from .DirectoryScanner import DirectoryScanner
+from .FileWriter import FileWriter
 from .Сonfig import Config
 
 user_config = Config("user_config.json", can_object_change_config=False)
 
 
+def get_setting(key: str, default: Any = None) -> Any:
+    """
+    Returns a setting from the `BACAP_<KEY>` environment variable or from the user's config.
+    :param key: Name of the setting in the user's config.
+    :param default: Value to return if the setting isn't set.
+    :return: Value of the setting (always str if it's from the environment).
+    """
+    env_value = os.environ.get(f"BACAP_{key.upper()}")
+    if env_value is not None:
+        return env_value
+    try:
+        return user_config[key]
+    except KeyError:
+        return default
+
+
+def get_flag_setting(key: str, default: bool = False) -> bool:
+    """
+    Returns a boolean setting. Values "1", "true", "yes" and "on" mean True.
+    :param key: Name of the setting.
+    :param default: Value to return if the setting isn't set.
+    :return: Value of the setting.
+    """
+    return str(get_setting(key, default)).lower() in ("1", "true", "yes", "on")
+
+
+def get_workers_setting(key: str, default: int = 0) -> int:
+    """
+    Returns the number of workers from a setting.
+    "auto" or a negative number means the number of CPU cores.
+    :param key: Name of the setting.
+    :param default: Value to return if the setting isn't set.
+    :return: Number of workers. 0 or 1 means working in the current process.
+    """
+    value = get_setting(key, default)
+    if value == "auto" or int(value) < 0:
+        return os.cpu_count() or 1
+    return int(value)
+
+
 def cut_namespace(string_with_namespace: str) -> str:
     if ":" in string_with_namespace:
         return string_with_namespace.split(":", 1)[1]
@@ -38,8 +82,9 @@ def mc_path_to_path(path_to_datapack: Path, typification: str, mcpath: str) -> P
     """
     namespace, relative_path = mcpath.split(":", 1)
     path_to_data = path_to_datapack / f"data/{namespace}/{typification}/{relative_path}"
-    for file in path_to_data.parent.iterdir():
-        if file.is_file() and file.stem == path_to_data.name:
+    _, files = DirectoryScanner.listdir(path_to_data.parent)
+    for file in files:
+        if file.stem == path_to_data.name:
             return file
     raise FileNotFoundError(f"Can't find {path_to_data.name} in {path_to_data}")
 
@@ -57,6 +102,9 @@ def get_file_text(path: Path, encoding: str = None) -> str:
     :param encoding: Encoding. Default value in config
     :return: File's content
     """
+    pending = FileWriter.read_pending_text(path, encoding)
+    if pending is not None:
+        return pending
     with path.open(encoding=encoding) as f:
         return f.read()
 
@@ -78,6 +126,37 @@ def get_adv_json(path: Path, encoding: str = "utf-8") -> Optional[dict]:
             return None
 
 
+def intern_json(data: Any) -> Any:
+    """
+    Returns parsed JSON with interned strings.
+    Equal keys and values of different files become one object,
+    which is also stored once by pickle.
+    :param data: Parsed JSON.
+    :return: Equal JSON.
+    """
+    if isinstance(data, dict):
+        return {sys.intern(key): intern_json(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [intern_json(value) for value in data]
+    if isinstance(data, str):
+        return sys.intern(data)
+    return data
+
+
+def copy_json(data: Any) -> Any:
+    """
+    Copies parsed JSON or decoded nbt.
+    Only dicts and lists are copied, other JSON and nbt types are immutable.
+    :param data: Parsed JSON or decoded nbt.
+    :return: Equal JSON, which doesn't share dicts and lists with data.
+    """
+    if isinstance(data, dict):
+        return {key: copy_json(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [copy_json(value) for value in data]
+    return data
+
+
 def fill_pattern(text: str, values: dict[str, str]) -> str:
     pattern = r"\[<(\w+)>\]"
 